@@ -1,12 +1,113 @@
 """Configuration management implementation for CHAD."""
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Set, Tuple
+import asyncio
+import functools
+import json
 import os
+import re
+import tempfile
 import yaml
 from pathlib import Path
 from ..interfaces import ConfigurationProvider
 from ..errors import ConfigurationError, ConfigNotFoundError, InvalidConfigError
 
+# Prefer the libyaml-backed loader when PyYAML was built against it.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+JSON_CACHE_SUFFIX = ".jsoncache"
+
+_MISSING = object()
+
+# Env values that can be converted without going through the YAML parser.
+# The scalar table mirrors the YAML 1.1 bool/null forms PyYAML resolves.
+# Numbers with leading zeros are left to YAML, which reads them as octal.
+_ENV_SCALARS = {
+    **{word: True for word in ('true', 'True', 'TRUE', 'yes', 'Yes', 'YES',
+                               'on', 'On', 'ON')},
+    **{word: False for word in ('false', 'False', 'FALSE', 'no', 'No', 'NO',
+                                'off', 'Off', 'OFF')},
+    **{word: None for word in ('', '~', 'null', 'Null', 'NULL')}
+}
+_ENV_NUMBER_RE = re.compile(r'-?(?:0|[1-9][0-9]*)(\.[0-9]+)?')
+# Anything that may be YAML syntax rather than a single plain scalar
+_ENV_YAML_SYNTAX_RE = re.compile(
+    r"""^[\s?:,\[\]{}#&*!|>'"%@`-]|[:#,\[\]{}'"\n\r\t]|\s$""")
+_YAML_RESOLVER = yaml.resolver.Resolver()
+_YAML_STR_TAG = 'tag:yaml.org,2002:str'
+
+
+_YAML_MERGE_TAG = 'tag:yaml.org,2002:merge'
+
+
+class _PartialLoadUnsupported(Exception):
+    """Raised when a YAML document cannot be loaded key by key."""
+
+
+def _compose_node(loader: Any, anchors: Dict[str, yaml.Node]) -> yaml.Node:
+    """Compose the next node from a loader's event stream."""
+    event = loader.get_event()
+    if isinstance(event, yaml.AliasEvent):
+        if event.anchor not in anchors:
+            # The anchor lives in a skipped value
+            raise _PartialLoadUnsupported()
+        return anchors[event.anchor]
+
+    if isinstance(event, yaml.ScalarEvent):
+        tag = event.tag
+        if tag is None or tag == '!':
+            tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+        node = yaml.ScalarNode(tag, event.value, event.start_mark,
+                               event.end_mark, style=event.style)
+        if event.anchor is not None:
+            anchors[event.anchor] = node
+        return node
+
+    if isinstance(event, yaml.SequenceStartEvent):
+        tag = event.tag
+        if tag is None or tag == '!':
+            tag = loader.resolve(yaml.SequenceNode, None, event.implicit)
+        node = yaml.SequenceNode(tag, [], event.start_mark, None,
+                                 flow_style=event.flow_style)
+        if event.anchor is not None:
+            anchors[event.anchor] = node
+        while not loader.check_event(yaml.SequenceEndEvent):
+            node.value.append(_compose_node(loader, anchors))
+        node.end_mark = loader.get_event().end_mark
+        return node
+
+    tag = event.tag
+    if tag is None or tag == '!':
+        tag = loader.resolve(yaml.MappingNode, None, event.implicit)
+    node = yaml.MappingNode(tag, [], event.start_mark, None,
+                            flow_style=event.flow_style)
+    if event.anchor is not None:
+        anchors[event.anchor] = node
+    while not loader.check_event(yaml.MappingEndEvent):
+        key_node = _compose_node(loader, anchors)
+        node.value.append((key_node, _compose_node(loader, anchors)))
+    node.end_mark = loader.get_event().end_mark
+    return node
+
+
+def _skip_node(loader: Any) -> None:
+    """Consume the events of the next node without building it."""
+    depth = 0
+    while True:
+        event = loader.get_event()
+        if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+            depth += 1
+        elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+            depth -= 1
+        if depth == 0:
+            return
+
+
+@functools.lru_cache(maxsize=1024)
+def _split_key(key: str) -> Tuple[str, ...]:
+    """Split a dotted configuration key into its segments."""
+    return tuple(key.split('.'))
+
 
 class YAMLConfigProvider(ConfigurationProvider):
     """Configuration provider using YAML files with environment override support."""
@@ -15,25 +116,35 @@ class YAMLConfigProvider(ConfigurationProvider):
         self,
         config_path: str,
         env_prefix: str = "CHAD_",
-        secrets_path: Optional[str] = None
+        secrets_path: Optional[str] = None,
+        json_cache: bool = False
     ):
         self._config: Dict[str, Any] = {}
         self._config_path = Path(config_path)
         self._env_prefix = env_prefix
         self._secrets_path = Path(secrets_path) if secrets_path else None
+        self._json_cache = json_cache
         self._loaded = False
 
-    async def load(self, source: str) -> Dict[str, Any]:
+    async def load(
+        self,
+        source: str,
+        top_keys: Optional[Set[str]] = None
+    ) -> Dict[str, Any]:
         """Load configuration from a source.
 
         Args:
             source: Path to configuration file
+            top_keys: Only load these top-level keys; parsing stops once
+                all of them have been read, so for a key that appears more
+                than once the first occurrence wins (a full load keeps the
+                last one)
 
         Returns:
             Loaded configuration dictionary
         """
         try:
-            config = await self._load_yaml(Path(source))
+            config = await self._load_yaml(Path(source), top_keys)
             return config
         except Exception as e:
             raise ConfigurationError(
@@ -42,13 +153,15 @@ class YAMLConfigProvider(ConfigurationProvider):
     async def initialize(self, config: Dict[str, Any]) -> None:
         """Initialize the configuration provider."""
         try:
-            # Load base configuration
-            self._config = await self.load(str(self._config_path))
-
-            # Load secrets if configured
+            # Load base configuration and secrets (if configured) concurrently
             if self._secrets_path and self._secrets_path.exists():
-                secrets = await self.load(str(self._secrets_path))
+                self._config, secrets = await asyncio.gather(
+                    self.load(str(self._config_path)),
+                    self.load(str(self._secrets_path))
+                )
                 self._merge_dict(self._config, secrets)
+            else:
+                self._config = await self.load(str(self._config_path))
 
             # Override with environment variables
             self._apply_env_overrides()
@@ -85,11 +198,14 @@ class YAMLConfigProvider(ConfigurationProvider):
             raise InvalidConfigError(f"Failed to set config value: {str(e)}")
 
     async def has(self, key: str) -> bool:
-        """Check if configuration key exists."""
+        """Check if configuration key exists, even if its value is None."""
+        if not self._loaded:
+            return False
+
         try:
-            value = await self.get(key)
-            return value is not None
-        except:
+            self._get_nested(self._config, key)
+            return True
+        except KeyError:
             return False
 
     async def get_namespace(self, namespace: str) -> Dict[str, Any]:
@@ -97,73 +213,245 @@ class YAMLConfigProvider(ConfigurationProvider):
         if not self._loaded:
             raise ConfigurationError("Configuration not initialized")
 
-        result = {}
-        for key, value in self._flatten_dict(self._config).items():
-            if key.startswith(namespace):
-                result[key] = value
-        return result
+        if not namespace:
+            return self._flatten_dict(self._config)
+        try:
+            subtree = self._get_nested(self._config, namespace)
+        except KeyError:
+            return {}
 
-    @staticmethod
-    async def _load_yaml(path: Path) -> Dict[str, Any]:
-        """Load YAML configuration file."""
+        if not isinstance(subtree, dict):
+            return {namespace: subtree}
+        return self._flatten_dict(subtree, namespace)
+
+    async def _load_yaml(
+        self,
+        path: Path,
+        top_keys: Optional[Set[str]] = None
+    ) -> Dict[str, Any]:
+        """Load YAML configuration file without blocking the event loop."""
         try:
-            with open(path, 'r') as f:
-                return yaml.safe_load(f) or {}
+            if top_keys is None:
+                return await asyncio.to_thread(self._read_yaml, path)
+            return await asyncio.to_thread(
+                self._read_yaml_partial, path, top_keys)
         except Exception as e:
             raise ConfigurationError(
                 f"Failed to load config file {path}: {str(e)}")
 
-    def _merge_dict(self, base: Dict, override: Dict) -> None:
-        """Recursively merge override dict into base dict."""
-        for key, value in override.items():
-            if (
-                key in base and
-                isinstance(base[key], dict) and
-                isinstance(value, dict)
-            ):
-                self._merge_dict(base[key], value)
+    def _read_yaml(self, path: Path) -> Dict[str, Any]:
+        """Read and parse a YAML file synchronously.
+
+        When JSON caching is enabled, a sidecar cache is used as long as the
+        source file's modification time and size match the ones it was
+        written for.
+        """
+        with open(path, 'rb') as f:
+            if not self._json_cache:
+                return yaml.load(f, Loader=YAML_LOADER) or {}
+
+            # Stat before parsing, so an edit made while parsing makes the
+            # cache stale instead of being masked by it
+            stat = os.fstat(f.fileno())
+            cached = self._read_json_cache(path, stat)
+            if cached is not None:
+                return cached
+            config = yaml.load(f, Loader=YAML_LOADER) or {}
+
+        self._write_json_cache(path, stat, config)
+        return config
+
+    def _read_yaml_partial(
+        self,
+        path: Path,
+        top_keys: Set[str]
+    ) -> Dict[str, Any]:
+        """Read only the requested top-level keys of a YAML mapping.
+
+        The file is consumed as an event stream: unrequested values are
+        skipped without being built, and reading stops once every requested
+        key has been seen, which means the first occurrence of a duplicated
+        key is returned. Documents this cannot handle (non-mapping root,
+        merge keys or aliases into skipped values) fall back to a full load.
+        """
+        try:
+            with open(path, 'rb') as f:
+                loader = YAML_LOADER(f)
+                try:
+                    return self._parse_top_keys(loader, set(top_keys))
+                finally:
+                    loader.dispose()
+        except _PartialLoadUnsupported:
+            config = self._read_yaml(path)
+            if not isinstance(config, dict):
+                return config
+            return {k: v for k, v in config.items() if k in top_keys}
+
+    @staticmethod
+    def _parse_top_keys(loader: Any, wanted: Set[str]) -> Dict[str, Any]:
+        """Build the wanted top-level entries from a loader's event stream."""
+        loader.get_event()  # StreamStartEvent
+        if loader.check_event(yaml.StreamEndEvent):
+            return {}
+        loader.get_event()  # DocumentStartEvent
+        if not loader.check_event(yaml.MappingStartEvent):
+            raise _PartialLoadUnsupported()
+        root_event = loader.get_event()
+
+        anchors: Dict[str, yaml.Node] = {}
+        pairs = []
+        while wanted and not loader.check_event(yaml.MappingEndEvent):
+            key_node = _compose_node(loader, anchors)
+            if key_node.tag == _YAML_MERGE_TAG:
+                raise _PartialLoadUnsupported()
+            key = (
+                key_node.value if key_node.tag == _YAML_STR_TAG
+                else loader.construct_document(key_node)
+            )
+            if key in wanted:
+                wanted.discard(key)
+                pairs.append((key_node, _compose_node(loader, anchors)))
             else:
-                base[key] = value
+                _skip_node(loader)
+
+        root = yaml.MappingNode(
+            loader.resolve(yaml.MappingNode, None, root_event.implicit),
+            pairs, root_event.start_mark, root_event.end_mark)
+        return loader.construct_document(root) or {}
+
+    @staticmethod
+    def _read_json_cache(
+        path: Path,
+        stat: os.stat_result
+    ) -> Optional[Dict[str, Any]]:
+        """Read the JSON sidecar cache for path if it matches stat."""
+        cache = path.with_suffix(path.suffix + JSON_CACHE_SUFFIX)
+        try:
+            cached = json.loads(cache.read_bytes())
+        except (OSError, ValueError):
+            return None
+        if (
+            not isinstance(cached, dict) or
+            cached.get("mtime_ns") != stat.st_mtime_ns or
+            cached.get("size") != stat.st_size
+        ):
+            return None
+        return cached.get("config")
+
+    @staticmethod
+    def _write_json_cache(
+        path: Path,
+        stat: os.stat_result,
+        config: Dict[str, Any]
+    ) -> None:
+        """Atomically write the JSON sidecar cache for path.
+
+        The cache records the source modification time and size from stat.
+        Configs that do not survive a JSON round trip unchanged (dates,
+        non-string keys, ...) are not cached.
+        """
+        try:
+            data = json.dumps({
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "config": config
+            })
+            if json.loads(data)["config"] != config:
+                return
+        except (TypeError, ValueError):
+            return
+
+        cache = path.with_suffix(path.suffix + JSON_CACHE_SUFFIX)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=cache.parent)
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data.encode())
+            os.replace(tmp_path, cache)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def _merge_dict(self, base: Dict, override: Dict) -> None:
+        """Deep merge override dict into base dict."""
+        stack = [(base, override)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                current = target.get(key, _MISSING)
+                if current is value:
+                    continue
+                if isinstance(current, dict) and isinstance(value, dict):
+                    if value:
+                        stack.append((current, value))
+                else:
+                    target[key] = value
 
     def _apply_env_overrides(self) -> None:
         """Apply environment variable overrides."""
-        for key, value in os.environ.items():
-            if key.startswith(self._env_prefix):
-                config_key = key[len(self._env_prefix):].lower().replace('__', '.')
-                try:
-                    # Try to parse as YAML for type conversion
-                    parsed_value = yaml.safe_load(value)
-                    # Ensure numeric strings are converted to numbers
-                    if isinstance(parsed_value, str):
-                        try:
-                            if '.' in parsed_value:
-                                parsed_value = float(parsed_value)
-                            else:
-                                parsed_value = int(parsed_value)
-                        except ValueError:
-                            pass  # Keep as string if conversion fails
-                    self._set_nested(self._config, config_key, parsed_value)
-                except yaml.YAMLError:
-                    # Fallback to string value if YAML parsing fails
-                    self._set_nested(self._config, config_key, value)
+        prefix = self._env_prefix
+        prefix_len = len(prefix)
+        environ = os.environ
+        # Filter on names first so values are only decoded for matches
+        for key in [key for key in environ if key.startswith(prefix)]:
+            config_key = key[prefix_len:].lower().replace('__', '.')
+            self._set_nested(self._config, config_key,
+                             self._parse_env_value(environ[key]))
+
+    @staticmethod
+    def _parse_env_value(value: str) -> Any:
+        """Convert an environment variable value to a typed config value."""
+        # Fast path for plain scalars, which is what most env vars hold
+        if value in _ENV_SCALARS:
+            return _ENV_SCALARS[value]
+        match = _ENV_NUMBER_RE.fullmatch(value)
+        if match:
+            return float(value) if match.group(1) else int(value)
+
+        # A plain scalar that YAML would resolve to a string needs no parse
+        if (
+            not _ENV_YAML_SYNTAX_RE.search(value) and
+            _YAML_RESOLVER.resolve(
+                yaml.ScalarNode, value, (True, False)) == _YAML_STR_TAG
+        ):
+            parsed_value = value
+        else:
+            try:
+                # Try to parse as YAML for type conversion
+                parsed_value = yaml.load(value, Loader=YAML_LOADER)
+            except yaml.YAMLError:
+                # Fallback to string value if YAML parsing fails
+                return value
+
+        # Ensure numeric strings are converted to numbers
+        if isinstance(parsed_value, str):
+            try:
+                if '.' in parsed_value:
+                    parsed_value = float(parsed_value)
+                else:
+                    parsed_value = int(parsed_value)
+            except ValueError:
+                pass  # Keep as string if conversion fails
+        return parsed_value
 
     def _get_nested(self, d: Dict, key: str) -> Any:
         """Get nested dictionary value using dot notation."""
-        keys = key.split('.')
         current = d
-
-        for k in keys:
-            if not isinstance(current, dict):
-                raise KeyError(f"Cannot access '{k}' in '{key}'")
-            if k not in current:
-                raise KeyError(f"Key '{k}' not found in '{key}'")
-            current = current[k]
+        try:
+            for k in _split_key(key):
+                current = current[k]
+        except (KeyError, TypeError):
+            raise KeyError(f"Key '{key}' not found") from None
 
         return current
 
     def _set_nested(self, d: Dict, key: str, value: Any) -> None:
         """Set nested dictionary value using dot notation."""
-        keys = key.split('.')
+        keys = _split_key(key)
         current = d
 
         for k in keys[:-1]:
@@ -176,12 +464,21 @@ class YAMLConfigProvider(ConfigurationProvider):
         current[keys[-1]] = value
 
     def _flatten_dict(self, d: Dict, parent_key: str = '') -> Dict[str, Any]:
-        """Flatten nested dictionary using dot notation."""
+        """Flatten nested dictionary using dot notation.
+
+        Keys come out in document order; the walk keeps a stack of item
+        iterators instead of recursing.
+        """
         items = []
-        for k, v in d.items():
-            new_key = f"{parent_key}.{k}" if parent_key else k
-            if isinstance(v, dict):
-                items.extend(self._flatten_dict(v, new_key).items())
-            else:
+        stack = [(parent_key, iter(d.items()))]
+        while stack:
+            prefix, entries = stack[-1]
+            for k, v in entries:
+                new_key = f"{prefix}.{k}" if prefix else k
+                if isinstance(v, dict):
+                    stack.append((new_key, iter(v.items())))
+                    break
                 items.append((new_key, v))
+            else:
+                stack.pop()
         return dict(items)
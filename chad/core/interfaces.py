@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Set, List
+from typing import Any, Dict, FrozenSet, Optional, Set, List
 from dataclasses import dataclass
 from enum import Enum, auto, IntFlag
 from datetime import datetime
@@ -13,20 +13,35 @@ class ProcessingStatus(IntFlag):
     FAILED = auto()
 
     def __str__(self) -> str:
-        return self.name.lower()
+        text = _STATUS_STR.get(self)
+        return text if text is not None else self.name.lower()
 
     def __repr__(self) -> str:
-        return f"ProcessingStatus.{self.name}"
+        text = _STATUS_REPR.get(self)
+        return text if text is not None else f"ProcessingStatus.{self.name}"
 
     @classmethod
-    def get_terminal_states(cls) -> Set['ProcessingStatus']:
+    def get_terminal_states(cls) -> FrozenSet['ProcessingStatus']:
         """Returns states that represent end of processing"""
-        return {cls.COMPLETED, cls.FAILED}
+        return _TERMINAL_STATES
 
     @classmethod
-    def get_active_states(cls) -> Set['ProcessingStatus']:
+    def get_active_states(cls) -> FrozenSet['ProcessingStatus']:
         """Returns states that represent active processing"""
-        return {cls.PENDING, cls.PROCESSING}
+        return _ACTIVE_STATES
+
+
+# Bit masks for cheap membership tests, e.g. `status & TERMINAL_MASK`
+TERMINAL_MASK = ProcessingStatus.COMPLETED | ProcessingStatus.FAILED
+ACTIVE_MASK = ProcessingStatus.PENDING | ProcessingStatus.PROCESSING
+
+_TERMINAL_STATES = frozenset({ProcessingStatus.COMPLETED, ProcessingStatus.FAILED})
+_ACTIVE_STATES = frozenset({ProcessingStatus.PENDING, ProcessingStatus.PROCESSING})
+
+# Precomputed str()/repr() of the single states
+_STATUS_STR = {status: status.name.lower() for status in ProcessingStatus}
+_STATUS_REPR = {status: f"ProcessingStatus.{status.name}"
+                for status in ProcessingStatus}
 
 
 @dataclass
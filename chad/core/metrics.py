@@ -1,9 +1,58 @@
 """Quality metrics tracking and reporting for CHAD system."""
 
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, field
+from typing import (
+    Dict, Any, Callable, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+)
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+from types import MappingProxyType
+import json
+import math
+import sys
+import threading
+import time
+
+try:
+    import orjson
+except ImportError:  # optional accelerator
+    orjson = None
+
+DEFAULT_MAX_SAMPLES = 10_000
+
+
+def report_to_json(report: Mapping[str, Any]) -> str:
+    """Serialize a metrics or performance report to a JSON string.
+
+    Uses orjson when it is installed and falls back to the standard
+    library otherwise. Both write datetimes in ISO 8601 format and
+    non-finite numbers (NaN, infinities) as ``null``.
+    """
+    if orjson is not None:
+        return orjson.dumps(report).decode()
+    return json.dumps(_finite(report), default=_json_default,
+                      separators=(",", ":"), allow_nan=False)
+
+
+def _finite(value: Any) -> Any:
+    """Replace non-finite floats in a report with None, as orjson does."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {k: _finite(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(v) for v in value]
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    """Convert values the json module cannot serialize by itself."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(
+        f"Object of type {type(value).__name__} is not JSON serializable")
 
 
 class MetricType(Enum):
@@ -14,41 +63,225 @@ class MetricType(Enum):
     DURATION = "duration"
 
 
-@dataclass
+@dataclass(slots=True, init=False)
 class MetricValue:
-    """Represents a single metric measurement."""
+    """Represents a single metric measurement.
+
+    The measurement time is stored as ``timestamp_ns``, nanoseconds since
+    the epoch. A ``timestamp`` datetime is still accepted in its place and
+    converted.
+    """
     value: float
-    timestamp: datetime = field(default_factory=datetime.now)
-    labels: Dict[str, str] = field(default_factory=dict)
+    timestamp_ns: int
+    labels: Dict[str, str]
+
+    def __init__(
+        self,
+        value: float,
+        timestamp_ns: Optional[int] = None,
+        labels: Optional[Dict[str, str]] = None,
+        *,
+        timestamp: Optional[datetime] = None
+    ):
+        if timestamp is not None:
+            if timestamp_ns is not None:
+                raise TypeError("Pass either timestamp or timestamp_ns, not both")
+            timestamp_ns = round(timestamp.timestamp() * 1_000_000) * 1000
+        self.value = value
+        self.timestamp_ns = time.time_ns() if timestamp_ns is None else timestamp_ns
+        self.labels = {} if labels is None else labels
+
+    @property
+    def timestamp(self) -> datetime:
+        """Measurement time as a local datetime."""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
 
 
 class QualityMetric:
-    """Base class for tracking quality metrics."""
+    """Base class for tracking quality metrics.
+
+    Only the most recent ``max_samples`` samples are retained; running
+    statistics returned by ``get_stats`` cover every recorded value.
+    """
+
+    __slots__ = (
+        "name", "type", "description", "unit", "max_samples",
+        "_values", "_timestamps", "_labels", "_head",
+        "_count", "_sum", "_min", "_max", "_mean", "_m2"
+    )
 
     def __init__(
         self,
         name: str,
         type: MetricType,
         description: str,
-        unit: str = ""
+        unit: str = "",
+        max_samples: int = DEFAULT_MAX_SAMPLES
     ):
-        self.name = name
+        if max_samples < 1:
+            raise ValueError("max_samples must be at least 1")
+        # Interned so registry and snapshot lookups compare by identity
+        self.name = sys.intern(name) if name.__class__ is str else name
         self.type = type
         self.description = description
         self.unit = unit
-        self._values: List[MetricValue] = []
+        self.max_samples = max_samples
+        # Samples are stored column-wise in a ring; the same index in each
+        # column describes one sample. Timestamps are nanoseconds since the
+        # epoch. Once full, _head points at the oldest sample.
+        self._values = array('d')
+        self._timestamps = array('q')
+        self._labels: List[Dict[str, str]] = []
+        self._head = 0
+        # Running statistics (Welford's algorithm for the variance)
+        self._count = 0
+        self._sum = 0.0
+        self._min = math.inf
+        self._max = -math.inf
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def record(self, value: float, **labels) -> None:
+        """Record a new metric value."""
+        value = float(value)
+        if len(self._values) < self.max_samples:
+            self._values.append(value)
+            self._timestamps.append(time.time_ns())
+            self._labels.append(labels)
+        else:
+            head = self._head
+            self._values[head] = value
+            self._timestamps[head] = time.time_ns()
+            self._labels[head] = labels
+            self._head = (head + 1) % self.max_samples
+
+        self._count += 1
+        self._sum += value
+        if value < self._min:
+            self._min = value
+        if value > self._max:
+            self._max = value
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (value - self._mean)
+
+    def _sample(self, index: int) -> MetricValue:
+        """Build a MetricValue for the sample stored at index."""
+        return MetricValue(
+            value=self._values[index],
+            timestamp_ns=self._timestamps[index],
+            labels=self._labels[index]
+        )
+
+    def get_latest(self) -> Optional[MetricValue]:
+        """Get the most recent metric value."""
+        return self._sample(self._head - 1) if self._values else None
+
+    def get_latest_value(self) -> Optional[float]:
+        """Get the most recent value without building a MetricValue."""
+        return self._values[self._head - 1] if self._values else None
+
+    def get_values(self) -> List[MetricValue]:
+        """Get all retained values, oldest first."""
+        size = len(self._values)
+        return [self._sample((self._head + i) % size) for i in range(size)]
+
+    @property
+    def count(self) -> int:
+        """Number of values recorded so far, including evicted ones."""
+        return self._count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get running statistics over all recorded values."""
+        if not self._count:
+            return {"count": 0, "sum": 0.0, "min": None, "max": None,
+                    "mean": None, "variance": None}
+        return {
+            "count": self._count,
+            "sum": self._sum,
+            "min": self._min,
+            "max": self._max,
+            "mean": self._mean,
+            "variance": self._m2 / self._count
+        }
+
+    def get_window_stats(self, window_ns: Optional[int] = None) -> Dict[str, Any]:
+        """Get statistics over the retained values.
+
+        Unlike ``get_stats``, which covers every value ever recorded, only
+        samples still held in the ring are included. With ``window_ns``,
+        only values recorded in the last ``window_ns`` nanoseconds are
+        included. Values are reduced straight from the storage columns,
+        assuming they were recorded in timestamp order.
+        """
+        values = self._values
+        head = self._head
+        runs = [values[head:], values[:head]] if head else [values]
+        if window_ns is not None:
+            cutoff = time.time_ns() - window_ns
+            stamps = self._timestamps
+            stamp_runs = [stamps[head:], stamps[:head]] if head else [stamps]
+            runs = [
+                run[bisect_left(run_stamps, cutoff):]
+                for run, run_stamps in zip(runs, stamp_runs)
+            ]
+        runs = [run for run in runs if run]
+
+        count = sum(map(len, runs))
+        if not count:
+            return {"count": 0, "sum": 0.0, "min": None, "max": None,
+                    "mean": None}
+        total = sum(map(sum, runs))
+        return {
+            "count": count,
+            "sum": total,
+            "min": min(map(min, runs)),
+            "max": max(map(max, runs)),
+            "mean": total / count
+        }
+
+
+class SynchronizedQualityMetric(QualityMetric):
+    """Quality metric that can be recorded and read from several threads.
+
+    Every read and write holds a per-metric lock.
+    """
+
+    __slots__ = ("_lock",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.RLock()
 
     def record(self, value: float, **labels) -> None:
         """Record a new metric value."""
-        self._values.append(MetricValue(value=value, labels=labels))
+        with self._lock:
+            super().record(value, **labels)
 
     def get_latest(self) -> Optional[MetricValue]:
         """Get the most recent metric value."""
-        return self._values[-1] if self._values else None
+        with self._lock:
+            return super().get_latest()
+
+    def get_latest_value(self) -> Optional[float]:
+        """Get the most recent value without building a MetricValue."""
+        with self._lock:
+            return super().get_latest_value()
 
     def get_values(self) -> List[MetricValue]:
-        """Get all recorded values."""
-        return self._values.copy()
+        """Get all retained values, oldest first."""
+        with self._lock:
+            return super().get_values()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get running statistics over all recorded values."""
+        with self._lock:
+            return super().get_stats()
+
+    def get_window_stats(self, window_ns: Optional[int] = None) -> Dict[str, Any]:
+        """Get statistics over the retained values."""
+        with self._lock:
+            return super().get_window_stats(window_ns)
 
 
 class MetricsRegistry:
@@ -56,12 +289,30 @@ class MetricsRegistry:
 
     def __init__(self):
         self._metrics: Dict[str, QualityMetric] = {}
+        self._metrics_view = MappingProxyType(self._metrics)
+        self._names: Optional[FrozenSet[str]] = None
+        self._version = 0
 
     def register(self, metric: QualityMetric) -> None:
         """Register a new metric."""
         if metric.name in self._metrics:
             raise ValueError(f"Metric {metric.name} already registered")
         self._metrics[metric.name] = metric
+        self._names = None
+        self._version += 1
+
+    def unregister(self, name: str) -> None:
+        """Remove a metric from the registry."""
+        if name not in self._metrics:
+            raise KeyError(f"Metric {name} not found")
+        del self._metrics[name]
+        self._names = None
+        self._version += 1
+
+    @property
+    def version(self) -> int:
+        """Counter bumped on every register and unregister."""
+        return self._version
 
     def get_metric(self, name: str) -> QualityMetric:
         """Get a metric by name."""
@@ -69,13 +320,56 @@ class MetricsRegistry:
             raise KeyError(f"Metric {name} not found")
         return self._metrics[name]
 
-    def get_all_metrics(self) -> Dict[str, QualityMetric]:
-        """Get all registered metrics."""
-        return self._metrics.copy()
+    def get_all_metrics(self) -> Mapping[str, QualityMetric]:
+        """Get a read-only live view of all registered metrics."""
+        return self._metrics_view
+
+    def get_metric_names(self) -> FrozenSet[str]:
+        """Get the names of all registered metrics.
+
+        The set is cached until a metric is registered or unregistered.
+        """
+        names = self._names
+        if names is None:
+            names = self._names = frozenset(self._metrics)
+        return names
+
+    def snapshot_values(self) -> Dict[str, float]:
+        """Get the latest value of every metric that has recorded one."""
+        values = {}
+        for name, metric in self._metrics.items():
+            value = metric.get_latest_value()
+            if value is not None:
+                values[name] = value
+        return values
 
     def record(self, name: str, value: float, **labels) -> None:
         """Record a value for a named metric."""
-        self.get_metric(name).record(value, **labels)
+        metric = self._metrics.get(name)
+        if metric is None:
+            raise KeyError(f"Metric {name} not found")
+        metric.record(value, **labels)
+
+    def record_batch(
+        self,
+        name: str,
+        samples: Iterable[Tuple[float, Dict[str, str]]]
+    ) -> None:
+        """Record several (value, labels) samples for a named metric."""
+        metric = self._metrics.get(name)
+        if metric is None:
+            raise KeyError(f"Metric {name} not found")
+        record = metric.record
+        for value, labels in samples:
+            record(value, **labels)
+
+    def get_recorder(self, name: str) -> Callable[..., None]:
+        """Get the record function of a named metric.
+
+        Hot paths can hold on to the returned callable to skip the name
+        lookup on every record.
+        """
+        return self.get_metric(name).record
 
 
 class QualityMetrics:
@@ -83,6 +377,7 @@ class QualityMetrics:
 
     def __init__(self):
         self.registry = MetricsRegistry()
+        self._report_cache: Dict[str, Tuple[QualityMetric, int, Dict[str, Any]]] = {}
         self._setup_default_metrics()
 
     def _setup_default_metrics(self):
@@ -108,15 +403,39 @@ class QualityMetrics:
         ))
 
     def get_metrics_report(self) -> Dict[str, Any]:
-        """Generate a report of all metrics."""
+        """Generate a report of all metrics.
+
+        Report entries are cached per metric and only rebuilt when the
+        metric has recorded new values since the last report.
+        """
+        metrics = self.registry.get_all_metrics()
+        cache = self._report_cache
+        if len(cache) > len(metrics):
+            for name in [name for name in cache if name not in metrics]:
+                del cache[name]
+
         report = {}
-        for name, metric in self.registry.get_all_metrics().items():
-            latest = metric.get_latest()
-            report[name] = {
-                "type": metric.type.value,
-                "description": metric.description,
-                "unit": metric.unit,
-                "latest_value": latest.value if latest else None,
-                "latest_timestamp": latest.timestamp if latest else None
-            }
+        for name, metric in metrics.items():
+            cached = cache.get(name)
+            if (
+                cached is None or
+                cached[0] is not metric or
+                cached[1] != metric.count
+            ):
+                latest = metric.get_latest()
+                entry = {
+                    "type": metric.type.value,
+                    "description": metric.description,
+                    "unit": metric.unit,
+                    "latest_value": latest.value if latest else None,
+                    "latest_timestamp": latest.timestamp if latest else None
+                }
+                cache[name] = (metric, metric.count, entry)
+            else:
+                entry = cached[2]
+            report[name] = dict(entry)
         return report
+
+    def get_metrics_report_json(self) -> str:
+        """Generate the metrics report serialized as JSON."""
+        return report_to_json(self.get_metrics_report())
@@ -1,14 +1,25 @@
 """Performance monitoring system for CHAD."""
 
-from typing import Dict, Any, Optional, List
+from typing import Deque, Dict, Any, Optional, List, Tuple
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from contextlib import contextmanager
-from time import perf_counter
-from .metrics import MetricsRegistry, QualityMetric, MetricType
+from operator import attrgetter
+import math
+import threading
+import weakref
+from time import perf_counter_ns, time_ns
+from .metrics import (
+    MetricsRegistry, QualityMetric, SynchronizedQualityMetric, MetricType,
+    report_to_json
+)
 
+DEFAULT_SNAPSHOT_CAPACITY = 10_000
 
-@dataclass
+
+@dataclass(slots=True)
 class PerformanceSnapshot:
     """Snapshot of performance metrics at a point in time."""
     timestamp: datetime
@@ -16,13 +27,207 @@ class PerformanceSnapshot:
     context: Dict[str, Any]
 
 
+_snapshot_time = attrgetter("timestamp")
+
+
+class _AggregateColumns:
+    """Per-bucket running snapshot aggregates, stored column-wise in a ring.
+
+    Slot ``i`` of every column describes the same time bucket. Each metric
+    owns four columns: sample count, sum, min and max. Buckets are kept in
+    time order; once the ring is full the oldest bucket's slot is reused.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.start = 0
+        self.length = 0
+        self.index = array('q', [0]) * size
+        self.snapshots = array('q', [0]) * size
+        self.metrics: Dict[str, Tuple[array, array, array, array]] = {}
+        # Number of snapshots folded in so far; changes whenever data does
+        self.version = 0
+
+    def add(self, index: int, values: Dict[str, float]) -> None:
+        """Fold one snapshot's values into the bucket with the given index."""
+        self.version += 1
+        last = (self.start + self.length - 1) % self.size
+        # A clock stepping backwards folds into the latest bucket
+        if self.length and self.index[last] >= index:
+            slot = last
+        else:
+            slot = self._open_bucket(index)
+        self.snapshots[slot] += 1
+
+        columns = self.metrics
+        for name, value in values.items():
+            metric_columns = columns.get(name)
+            if metric_columns is None:
+                metric_columns = columns[name] = self._new_metric()
+            counts, sums, mins, maxs = metric_columns
+            counts[slot] += 1
+            sums[slot] += value
+            if value < mins[slot]:
+                mins[slot] = value
+            if value > maxs[slot]:
+                maxs[slot] = value
+
+    def summarize(
+        self, first_index: int
+    ) -> Tuple[int, Dict[str, Tuple[int, float, float, float]]]:
+        """Merge all buckets from first_index onwards.
+
+        Returns the snapshot count and ``(count, sum, min, max)`` per metric
+        that has samples in range.
+        """
+        # The ring holds at most two sorted runs of slots
+        end = self.start + self.length
+        runs = [(self.start, min(end, self.size)), (0, max(end - self.size, 0))]
+        ranges = []
+        for lo, hi in runs:
+            if lo < hi:
+                ranges.append((bisect_left(self.index, first_index, lo, hi), hi))
+
+        snapshots = sum(sum(self.snapshots[lo:hi]) for lo, hi in ranges)
+        totals = {}
+        for name, (counts, sums, mins, maxs) in self.metrics.items():
+            count = sum(sum(counts[lo:hi]) for lo, hi in ranges)
+            if count:
+                totals[name] = (
+                    count,
+                    sum(sum(sums[lo:hi]) for lo, hi in ranges),
+                    min(min(mins[lo:hi], default=math.inf) for lo, hi in ranges),
+                    max(max(maxs[lo:hi], default=-math.inf) for lo, hi in ranges)
+                )
+        return snapshots, totals
+
+    def _open_bucket(self, index: int) -> int:
+        """Claim and reset the slot for a new, latest bucket."""
+        if self.length < self.size:
+            slot = (self.start + self.length) % self.size
+            self.length += 1
+        else:
+            slot = self.start
+            self.start = (self.start + 1) % self.size
+
+        self.index[slot] = index
+        self.snapshots[slot] = 0
+        for counts, sums, mins, maxs in self.metrics.values():
+            counts[slot] = 0
+            sums[slot] = 0.0
+            mins[slot] = math.inf
+            maxs[slot] = -math.inf
+        return slot
+
+    def _new_metric(self) -> Tuple[array, array, array, array]:
+        """Create empty columns for a metric seen for the first time."""
+        size = self.size
+        return (
+            array('q', [0]) * size,
+            array('d', [0.0]) * size,
+            array('d', [math.inf]) * size,
+            array('d', [-math.inf]) * size
+        )
+
+
 class PerformanceMonitor:
-    """Monitors and tracks system performance metrics."""
+    """Monitors and tracks system performance metrics.
+
+    Only the most recent ``capacity`` snapshots are kept. Besides those,
+    the monitor keeps per-bucket running aggregates for the last
+    ``history`` so reports do not have to rescan individual snapshots.
+
+    With ``latency_batch_size`` above 1, ``measure_time`` queues latencies
+    and records them in batches; queued values are flushed when the batch
+    is full, on ``take_snapshot`` and on ``flush_latency``. With
+    ``flush_interval`` set, which requires batching, a daemon thread also
+    flushes them at that interval until ``close`` is called or the monitor
+    is garbage collected; the ``latency`` metric is then a
+    ``SynchronizedQualityMetric`` so it can be read and recorded from
+    other threads meanwhile.
+
+    With ``context_retention`` set, snapshots older than it have their
+    ``context`` replaced by an empty dict when later snapshots are taken;
+    their metrics are kept.
 
-    def __init__(self, metrics_registry: MetricsRegistry):
+    The latest report is cached for ``report_cache_ttl`` and reused for
+    calls with the same window; a new snapshot or a change in registered
+    metrics invalidates it early, and ``invalidate_cache`` drops it. A
+    zero TTL disables the cache.
+
+    Snapshot times come from a monotonic clock anchored to the wall clock
+    when the monitor is created, so they never go backwards (keeping the
+    time-ordered storage valid) even if the system clock is adjusted.
+    """
+
+    def __init__(
+        self,
+        metrics_registry: MetricsRegistry,
+        history: timedelta = timedelta(hours=1),
+        bucket_size: timedelta = timedelta(seconds=1),
+        capacity: int = DEFAULT_SNAPSHOT_CAPACITY,
+        latency_batch_size: int = 1,
+        context_retention: Optional[timedelta] = None,
+        report_cache_ttl: timedelta = timedelta(seconds=1),
+        flush_interval: Optional[timedelta] = None
+    ):
+        if bucket_size <= timedelta(0) or history < bucket_size:
+            raise ValueError("history must be at least one positive bucket_size")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if latency_batch_size < 1:
+            raise ValueError("latency_batch_size must be at least 1")
+        if context_retention is not None and context_retention < timedelta(0):
+            raise ValueError("context_retention must not be negative")
+        if report_cache_ttl < timedelta(0):
+            raise ValueError("report_cache_ttl must not be negative")
+        if flush_interval is not None:
+            if flush_interval <= timedelta(0):
+                raise ValueError("flush_interval must be positive")
+            if latency_batch_size == 1:
+                raise ValueError(
+                    "flush_interval requires latency_batch_size above 1")
         self.metrics_registry = metrics_registry
+        # Live read-only view; reflects metrics registered later on
+        self._metrics = metrics_registry.get_all_metrics()
+        self._capacity = capacity
+        # Snapshots in time order. Only the newest ``capacity`` are visible;
+        # older ones are trimmed in bulk once the list has grown by a
+        # quarter of the capacity, keeping appends amortized O(1) while
+        # the list stays sliceable.
         self._snapshots: List[PerformanceSnapshot] = []
+        self._trim_at = capacity + capacity // 4 + 1
+        self._bucket_ns = bucket_size // timedelta(microseconds=1) * 1000
+        self._clock_offset_ns = time_ns() - perf_counter_ns()
+        self._aggregates = _AggregateColumns(int(history / bucket_size))
+        self._latency_batch_size = latency_batch_size
+        self._pending_latency: Deque[Tuple[float, Dict[str, str]]] = deque()
+        self._flush_lock = threading.Lock()
+        self._stop_flushing = threading.Event()
+        self._flush_thread: Optional[threading.Thread] = None
+        self._flush_interval = flush_interval
+        self._context_retention = context_retention
+        # Snapshots still holding a context, oldest first
+        self._with_context: Deque[PerformanceSnapshot] = deque(maxlen=capacity)
+        self._report_cache_ttl_ns = (
+            report_cache_ttl // timedelta(microseconds=1) * 1000)
+        # Latest report as (window, expiry in perf_counter_ns, data
+        # version, report)
+        self._report_cache: Optional[Tuple[timedelta, int, Tuple[int, int],
+                                           Dict[str, Any]]] = None
         self._setup_performance_metrics()
+        if flush_interval is not None:
+            # The thread only holds a weak reference, and the monitor being
+            # collected stops it
+            self._flush_thread = threading.Thread(
+                target=_flush_periodically,
+                args=(weakref.ref(self), self._stop_flushing,
+                      flush_interval.total_seconds()),
+                name="chad-latency-flush",
+                daemon=True
+            )
+            weakref.finalize(self, self._stop_flushing.set)
+            self._flush_thread.start()
 
     def _setup_performance_metrics(self) -> None:
         """Setup default performance metrics."""
@@ -40,7 +245,12 @@ class PerformanceMonitor:
             unit="bytes"
         ))
 
-        self.metrics_registry.register(QualityMetric(
+        # The flush thread records latencies concurrently with callers
+        latency_metric = (
+            QualityMetric if self._flush_interval is None
+            else SynchronizedQualityMetric
+        )
+        self.metrics_registry.register(latency_metric(
             name="latency",
             type=MetricType.HISTOGRAM,
             description="Operation latency",
@@ -49,66 +259,143 @@ class PerformanceMonitor:
 
     def take_snapshot(self, context: Dict[str, Any] = None) -> PerformanceSnapshot:
         """Take a snapshot of current performance metrics."""
-        metrics = {}
-        for name, metric in self.metrics_registry.get_all_metrics().items():
-            latest = metric.get_latest()
-            if latest:
-                metrics[name] = latest.value
-
+        self.flush_latency()
+        now_ns = perf_counter_ns() + self._clock_offset_ns
         snapshot = PerformanceSnapshot(
-            timestamp=datetime.now(),
-            metrics=metrics,
+            timestamp=datetime.fromtimestamp(now_ns / 1e9),
+            metrics=self.metrics_registry.snapshot_values(),
             context=context or {}
         )
-        self._snapshots.append(snapshot)
+        snapshots = self._snapshots
+        snapshots.append(snapshot)
+        if len(snapshots) >= self._trim_at:
+            del snapshots[:-self._capacity]
+        self._aggregates.add(now_ns // self._bucket_ns, snapshot.metrics)
+        if self._context_retention is not None:
+            self._expire_contexts(snapshot)
         return snapshot
 
+    def _expire_contexts(self, snapshot: PerformanceSnapshot) -> None:
+        """Drop the context of snapshots older than the context retention."""
+        with_context = self._with_context
+        if snapshot.context:
+            with_context.append(snapshot)
+        cutoff = snapshot.timestamp - self._context_retention
+        while with_context and with_context[0].timestamp < cutoff:
+            with_context.popleft().context = {}
+
     def get_snapshots(self,
                       start_time: Optional[datetime] = None,
                       end_time: Optional[datetime] = None) -> List[PerformanceSnapshot]:
-        """Get performance snapshots within the specified time range."""
-        if not start_time:
-            start_time = datetime.min
-        if not end_time:
-            end_time = datetime.max
-
-        return [
-            snapshot for snapshot in self._snapshots
-            if start_time <= snapshot.timestamp <= end_time
-        ]
-
-    @contextmanager
-    def measure_time(self, operation_name: str, **labels):
+        """Get performance snapshots within the specified time range.
+
+        Snapshots are stored in the order they were taken in a list, so the
+        range is located by binary search on their timestamps and copied
+        with a slice: O(log n) plus the size of the result.
+        """
+        snapshots = self._snapshots
+        hi = len(snapshots)
+        lo = max(hi - self._capacity, 0)
+        if start_time:
+            lo = bisect_left(snapshots, start_time, lo=lo, key=_snapshot_time)
+        if end_time:
+            hi = bisect_right(snapshots, end_time, lo=lo, key=_snapshot_time)
+
+        return snapshots[lo:hi]
+
+    def measure_time(self, operation_name: str, **labels) -> "_TimeMeasurement":
         """Context manager to measure operation execution time."""
-        start_time = perf_counter()
-        try:
-            yield
-        finally:
-            end_time = perf_counter()
-            duration = end_time - start_time
+        return _TimeMeasurement(self, operation_name, labels)
+
+    def _record_latency(self, duration: float, operation_name: str,
+                        labels: Dict[str, str]) -> None:
+        """Record or queue one measured operation latency."""
+        if self._latency_batch_size == 1:
             self.metrics_registry.record("latency", duration,
                                          operation=operation_name, **labels)
+        else:
+            pending = self._pending_latency
+            pending.append(
+                (duration, dict(operation=operation_name, **labels)))
+            if len(pending) >= self._latency_batch_size:
+                self.flush_latency()
+
+    def flush_latency(self) -> None:
+        """Record all queued latency measurements."""
+        pending = self._pending_latency
+        if not pending:
+            return
+        with self._flush_lock:
+            batch = [pending.popleft() for _ in range(len(pending))]
+            self.metrics_registry.record_batch("latency", batch)
+
+    def close(self) -> None:
+        """Stop the background flush thread, if any, and flush the queue."""
+        thread = self._flush_thread
+        if thread is not None:
+            self._stop_flushing.set()
+            thread.join()
+            self._flush_thread = None
+        self.flush_latency()
 
     def get_performance_report(self,
                                window: timedelta = timedelta(minutes=5)) -> Dict[str, Any]:
-        """Generate a performance report for the specified time window."""
-        end_time = datetime.now()
+        """Generate a performance report for the specified time window.
+
+        The report is built from the bucket aggregates, so snapshots are
+        included with bucket granularity at the start of the window.
+        Each call returns its own copy of the report.
+        """
+        now = perf_counter_ns()
+        version = (self._aggregates.version, self.metrics_registry.version)
+        cached = self._report_cache
+        if (
+            cached is not None and
+            cached[0] == window and
+            cached[1] > now and
+            cached[2] == version
+        ):
+            return _copy_report(cached[3])
+
+        report = self._build_report(window, now)
+        if self._report_cache_ttl_ns:
+            self._report_cache = (
+                window, now + self._report_cache_ttl_ns, version, report)
+            return _copy_report(report)
+        return report
+
+    def get_performance_report_json(
+            self, window: timedelta = timedelta(minutes=5)) -> str:
+        """Generate the performance report serialized as JSON."""
+        return report_to_json(self.get_performance_report(window))
+
+    def invalidate_cache(self) -> None:
+        """Drop the cached performance report."""
+        self._report_cache = None
+
+    def _build_report(self, window: timedelta, now: int) -> Dict[str, Any]:
+        """Build a performance report for window ending at perf counter now."""
+        end_ns = now + self._clock_offset_ns
+        end_time = datetime.fromtimestamp(end_ns / 1e9)
         start_time = end_time - window
-        snapshots = self.get_snapshots(start_time, end_time)
+        window_ns = window // timedelta(microseconds=1) * 1000
+        first_index = (end_ns - window_ns) // self._bucket_ns
+
+        total_snapshots, totals = self._aggregates.summarize(first_index)
 
-        if not snapshots:
+        if not total_snapshots:
             return {"error": "No data available for the specified time window"}
 
         metrics_summary = {}
-        for name in self.metrics_registry.get_all_metrics().keys():
-            values = [s.metrics.get(name)
-                      for s in snapshots if name in s.metrics]
-            if values:
+        for name in self._metrics:
+            stats = totals.get(name)
+            if stats:
+                count, total, low, high = stats
                 metrics_summary[name] = {
-                    "min": min(values),
-                    "max": max(values),
-                    "avg": sum(values) / len(values),
-                    "samples": len(values)
+                    "min": low,
+                    "max": high,
+                    "avg": total / count,
+                    "samples": count
                 }
 
         return {
@@ -117,5 +404,56 @@ class PerformanceMonitor:
                 "end": end_time
             },
             "metrics": metrics_summary,
-            "total_snapshots": len(snapshots)
+            "total_snapshots": total_snapshots
         }
+
+
+def _copy_report(report: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a performance report down to its per-metric dicts."""
+    copied = dict(report)
+    if "metrics" in copied:
+        copied["time_window"] = dict(copied["time_window"])
+        copied["metrics"] = {
+            name: dict(stats) for name, stats in copied["metrics"].items()
+        }
+    return copied
+
+
+def _flush_periodically(monitor_ref: "weakref.ref[PerformanceMonitor]",
+                        stop: threading.Event, interval: float) -> None:
+    """Flush a monitor's queued latencies every interval seconds.
+
+    Runs until stop is set or the monitor has been garbage collected.
+    """
+    while not stop.wait(interval):
+        monitor = monitor_ref()
+        if monitor is None:
+            return
+        monitor.flush_latency()
+        del monitor
+
+
+class _TimeMeasurement:
+    """Context manager returned by ``PerformanceMonitor.measure_time``.
+
+    A plain class with ``__slots__`` is cheaper to enter and exit than a
+    generator-based ``contextmanager``.
+    """
+
+    __slots__ = ("_monitor", "_operation", "_labels", "_start")
+
+    def __init__(self, monitor: PerformanceMonitor, operation_name: str,
+                 labels: Dict[str, str]):
+        self._monitor = monitor
+        self._operation = operation_name
+        self._labels = labels
+        self._start = 0
+
+    def __enter__(self) -> "_TimeMeasurement":
+        self._start = perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        duration = (perf_counter_ns() - self._start) / 1e9
+        self._monitor._record_latency(duration, self._operation, self._labels)
+        return False
@@ -1,35 +1,95 @@
 """Validation framework for CHAD system."""
 
-from typing import Any, Dict, List, Optional, Callable, Type
+import functools
+import sys
+from typing import Any, Dict, List, Optional, Callable, Tuple, Type
 from dataclasses import dataclass
 from .errors import ValidationError
 
 
 @dataclass
 class ValidationRule:
-    """Represents a validation rule with its check function and error message."""
+    """Represents a validation rule with its check function and error message.
+
+    Set ``safe`` for checks that cannot raise (plain ``isinstance`` or
+    comparison tests); they run without a per-rule ``try``/``except``.
+    """
     name: str
     check: Callable[[Any], bool]
     message: str
     details: Optional[Dict[str, Any]] = None
+    safe: bool = False
+
+    def __post_init__(self):
+        if type(self.name) is str:
+            self.name = sys.intern(self.name)
 
 
 class Validator:
-    """Base validator class that can be extended for specific validation needs."""
+    """Base validator class that can be extended for specific validation needs.
+
+    With ``reorder_every`` set, the validator counts runs and failures per
+    rule and, every ``reorder_every`` validations, reorders its rules so
+    the ones with the highest failure rate run first. This lets
+    ``fail_fast`` reject typical bad input sooner; error records follow
+    the same order.
+    """
 
-    def __init__(self):
+    def __init__(self, reorder_every: int = 0):
+        if reorder_every < 0:
+            raise ValueError("reorder_every must not be negative")
         self.rules: Dict[str, ValidationRule] = {}
-        self._validation_errors: List[Dict[str, Any]] = []
+        self._rules: Tuple[ValidationRule, ...] = ()
+        self._safe_checks: Tuple[Callable[[Any], bool], ...] = ()
+        self._safe_meta: Tuple[Dict[str, Any], ...] = ()
+        self._validation_errors: Tuple[Dict[str, Any], ...] = ()
+        self._reorder_every = reorder_every
+        self._failure_counts: Dict[str, int] = {}
+        self._run_counts: Dict[str, int] = {}
+        # Rule names in evaluation order, and each name's position
+        self._rule_order: Tuple[str, ...] = ()
+        self._rule_positions: Dict[str, int] = {}
+        self._validations = 0
 
     def add_rule(self, rule: ValidationRule) -> None:
-        """Add a validation rule."""
+        """Add a validation rule.
+
+        Rules should only be added through this method, which keeps the
+        tuples iterated by ``validate`` in sync with ``rules``. Safe rules
+        are checked before the others.
+        """
         self.rules[rule.name] = rule
+        self._index_rules()
+
+    def _index_rules(self) -> None:
+        """Rebuild the tuples of rules iterated by ``validate``."""
+        rules = list(self.rules.values())
+        if self._reorder_every:
+            failures = self._failure_counts
+            runs = self._run_counts
+            rules.sort(
+                key=lambda r: failures.get(r.name, 0) / runs.get(r.name, 1),
+                reverse=True
+            )
+        safe = [r for r in rules if r.safe]
+        self._safe_checks = tuple(r.check for r in safe)
+        self._safe_meta = tuple(
+            {"rule": r.name, "message": r.message, "details": r.details}
+            for r in safe
+        )
+        self._rules = tuple(r for r in rules if not r.safe)
+        self._rule_order = tuple(r.name for r in safe) + tuple(
+            r.name for r in self._rules)
+        self._rule_positions = {
+            name: i for i, name in enumerate(self._rule_order)}
 
-    def validate(self, data: Any) -> bool:
+    def validate(self, data: Any, fail_fast: bool = False) -> bool:
         """Validate data against all registered rules.
 
         Args:
             data: Data to validate
+            fail_fast: Stop at the first failing rule, so at most one
+                error is reported
 
         Returns:
             True if all validations pass
@@ -37,42 +97,103 @@ class Validator:
         Raises:
             ValidationError: If any validation fails
         """
-        self._validation_errors = []
+        errors: List[Dict[str, Any]] = []
+        self._collect_errors(data, errors, fail_fast)
+        self._validation_errors = tuple(errors)
+        if self._reorder_every:
+            self._track_failures(errors, fail_fast)
+
+        if errors:
+            raise ValidationError(
+                message="Validation failed",
+                details={"errors": errors}
+            )
 
-        for rule in self.rules.values():
+        return True
+
+    def _collect_errors(self, data: Any, errors: List[Dict[str, Any]],
+                        fail_fast: bool = False) -> None:
+        """Append an error record to errors for every rule data fails.
+
+        With fail_fast, return as soon as errors is non-empty.
+        """
+        if fail_fast and errors:
+            return
+
+        checks = self._safe_checks
+        if checks:
+            meta = self._safe_meta
+            if fail_fast:
+                for i, check in enumerate(checks):
+                    if not check(data):
+                        errors.append(dict(meta[i]))
+                        return
+            else:
+                results = [check(data) for check in checks]
+                # Error records are only built when something failed
+                if not all(results):
+                    errors.extend([
+                        dict(meta[i])
+                        for i, passed in enumerate(results)
+                        if not passed
+                    ])
+
+        for rule in self._rules:
             try:
                 if not rule.check(data):
-                    self._validation_errors.append({
+                    errors.append({
                         "rule": rule.name,
                         "message": rule.message,
                         "details": rule.details
                     })
             except Exception as e:
-                self._validation_errors.append({
+                reason = str(e)
+                errors.append({
                     "rule": rule.name,
-                    "message": f"Validation check failed: {str(e)}",
-                    "details": {"error": str(e)}
+                    "message": f"Validation check failed: {reason}",
+                    "details": {"error": reason}
                 })
+            if fail_fast and errors:
+                return
 
-        if self._validation_errors:
-            raise ValidationError(
-                message="Validation failed",
-                details={"errors": self._validation_errors}
-            )
+    def _track_failures(self, errors: List[Dict[str, Any]],
+                        fail_fast: bool) -> None:
+        """Count runs and failures per rule and periodically reorder rules."""
+        positions = self._rule_positions
+        ran = self._rule_order
+        if fail_fast and errors:
+            # Only the rules up to the first failure were evaluated
+            position = positions.get(errors[0]["rule"])
+            ran = ran[:position + 1] if position is not None else ()
 
-        return True
+        runs = self._run_counts
+        for name in ran:
+            runs[name] = runs.get(name, 0) + 1
+        failures = self._failure_counts
+        for error in errors:
+            name = error["rule"]
+            if name in positions:
+                failures[name] = failures.get(name, 0) + 1
+        self._validations += 1
+        if self._validations >= self._reorder_every:
+            self._validations = 0
+            self._index_rules()
 
     @property
-    def errors(self) -> List[Dict[str, Any]]:
-        """Get list of validation errors."""
-        return self._validation_errors.copy()
+    def errors(self) -> Tuple[Dict[str, Any], ...]:
+        """Get the errors from the last validation.
+
+        The tuple is returned without copying; use ``list(validator.errors)``
+        for a mutable copy.
+        """
+        return self._validation_errors
 
 
 class ContentValidator(Validator):
     """Validator for content processing."""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, reorder_every: int = 0):
+        super().__init__(reorder_every)
         self._add_default_rules()
 
     def _add_default_rules(self):
@@ -85,20 +206,112 @@ class ContentValidator(Validator):
 
 
 class ConfigValidator(Validator):
-    """Validator for configuration data."""
+    """Validator for configuration data.
+
+    Schema type checks run in a function generated for the schema rather
+    than as one generic rule per field; rules added with ``add_rule`` run
+    after them.
+    """
 
-    def __init__(self, schema: Dict[str, Type]):
-        super().__init__()
+    def __init__(self, schema: Dict[str, Type], reorder_every: int = 0):
+        super().__init__(reorder_every)
         self.schema = schema
         self._add_schema_rules()
 
     def _add_schema_rules(self):
-        """Add rules based on schema definition."""
-        for key, expected_type in self.schema.items():
-            self.add_rule(ValidationRule(
-                name=f"type_{key}",
-                check=lambda x, k=key, t=expected_type: isinstance(
-                    x.get(k), t),
-                message=f"Field '{key}' must be of type {expected_type.__name__}",
-                details={"field": key, "expected_type": expected_type.__name__}
-            ))
+        """Compile the type checks for the schema.
+
+        Validators built for the same schema share the compiled check and
+        rule names, so constructing one per request costs a cache lookup.
+        """
+        self._schema_rule_names, self._check_schema = _compile_schema_check(
+            tuple(self.schema.items()))
+
+    def _collect_errors(self, data: Any, errors: List[Dict[str, Any]],
+                        fail_fast: bool = False) -> None:
+        """Check the schema field types, then any additional rules."""
+        try:
+            get = data.get
+        except AttributeError as e:
+            names = self._schema_rule_names
+            for name in names[:1] if fail_fast else names:
+                errors.append({
+                    "rule": name,
+                    "message": f"Validation check failed: {str(e)}",
+                    "details": {"error": str(e)}
+                })
+        else:
+            start = len(errors)
+            try:
+                self._check_schema(get, errors, fail_fast)
+            except Exception:
+                # Redo the fields one at a time to report the failing check
+                del errors[start:]
+                self._check_schema_guarded(get, errors, fail_fast)
+
+        super()._collect_errors(data, errors, fail_fast)
+
+    def _check_schema_guarded(self, get: Callable[[str], Any],
+                              errors: List[Dict[str, Any]],
+                              fail_fast: bool = False) -> None:
+        """Check the schema fields with per-field exception handling."""
+        fields = zip(self._schema_rule_names, self.schema.items())
+        for name, (key, expected_type) in fields:
+            try:
+                if isinstance(get(key), expected_type):
+                    continue
+                errors.append(_schema_error(name, key, expected_type))
+            except Exception as e:
+                reason = str(e)
+                errors.append({
+                    "rule": name,
+                    "message": f"Validation check failed: {reason}",
+                    "details": {"error": reason}
+                })
+            if fail_fast:
+                return
+
+
+def _schema_error(name: str, key: str, expected_type: Type) -> Dict[str, Any]:
+    """Build the error record for a field that fails its type check."""
+    return {
+        "rule": name,
+        "message": f"Field '{key}' must be of type {expected_type.__name__}",
+        "details": {"field": key, "expected_type": expected_type.__name__}
+    }
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_schema_check(
+    fields: Tuple[Tuple[str, Type], ...]
+) -> Tuple[Tuple[str, ...],
+           Callable[[Callable[[str], Any], List[Dict[str, Any]], bool], None]]:
+    """Generate a type-check function specialized for schema fields.
+
+    Returns the schema rule names along with the function. The function
+    takes the data's ``get`` method, the error list and a fail-fast flag,
+    and runs one inlined ``isinstance`` check per field without exception
+    handling. Schema values are bound as globals of the generated code,
+    never spliced into its source.
+
+    Each field's error record is built once here and copied, including its
+    details, on every failure.
+    """
+    namespace: Dict[str, Any] = {}
+    lines = ["def check(get, errors, fail_fast=False):"]
+    names = []
+    for i, (key, expected_type) in enumerate(fields):
+        name = sys.intern(f"type_{key}")
+        names.append(name)
+        namespace[f"_key{i}"] = key
+        namespace[f"_type{i}"] = expected_type
+        namespace[f"_error{i}"] = _schema_error(name, key, expected_type)
+        lines.append(f"    if not isinstance(get(_key{i}), _type{i}):")
+        lines.append(f"        errors.append({{**_error{i}, "
+                     f"'details': dict(_error{i}['details'])}})")
+        lines.append("        if fail_fast:")
+        lines.append("            return None")
+    lines.append("    return None")
+
+    exec(compile("\n".join(lines), "<schema check>", "exec"), namespace)
+    return tuple(names), namespace["check"]
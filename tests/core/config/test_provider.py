@@ -1,8 +1,14 @@
 import pytest
+import json
 import os
 import tempfile
+import yaml
 from pathlib import Path
-from chad.core.config.provider import YAMLConfigProvider
+from chad.core.config.provider import (
+    YAMLConfigProvider,
+    YAML_LOADER,
+    JSON_CACHE_SUFFIX
+)
 from chad.core.errors import ConfigurationError, InvalidConfigError
 
 
@@ -84,6 +90,22 @@ async def test_secrets_loading(config_file, secrets_file):
     assert await provider.get("app.name") == "CHAD"
 
 
+@pytest.mark.asyncio
+async def test_secrets_override_base(config_file):
+    """Test secrets take precedence over base config when loaded concurrently."""
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+        f.write("database:\n  host: db.internal\n")
+
+    try:
+        provider = YAMLConfigProvider(config_file, secrets_path=f.name)
+        await provider.initialize({})
+
+        assert await provider.get("database.host") == "db.internal"
+        assert await provider.get("database.port") == 5432
+    finally:
+        os.unlink(f.name)
+
+
 @pytest.mark.asyncio
 async def test_environment_override():
     """Test environment variable overrides."""
@@ -118,6 +140,38 @@ async def test_config_namespace(config_file):
     assert "database.port" in database_config
 
 
+@pytest.mark.asyncio
+async def test_config_namespace_subtree_only(config_file):
+    """Test namespaces match whole key segments only."""
+    provider = YAMLConfigProvider(config_file)
+    await provider.initialize({"data": {"dir": "/tmp"}})
+
+    assert await provider.get_namespace("data") == {"data.dir": "/tmp"}
+    assert await provider.get_namespace("database.host") == {
+        "database.host": "localhost"}
+    assert await provider.get_namespace("missing") == {}
+
+    # The empty namespace covers the whole config
+    everything = await provider.get_namespace("")
+    assert everything["data.dir"] == "/tmp"
+    assert everything["database.host"] == "localhost"
+
+
+@pytest.mark.asyncio
+async def test_config_namespace_document_order():
+    """Test flattened namespace keys follow document order."""
+    config_path = create_temp_yaml(
+        "ns:\n  a:\n    x: 1\n  b: 2\n  c:\n    y: 3\n    z:\n      w: 4\n")
+
+    try:
+        provider = YAMLConfigProvider(config_path)
+        await provider.initialize({})
+        namespace = await provider.get_namespace("ns")
+        assert list(namespace) == ["ns.a.x", "ns.b", "ns.c.y", "ns.c.z.w"]
+    finally:
+        os.unlink(config_path)
+
+
 @pytest.mark.asyncio
 async def test_config_modification():
     """Test configuration modification."""
@@ -139,6 +193,64 @@ async def test_config_modification():
             pass
 
 
+@pytest.mark.asyncio
+async def test_initialize_override_merge(config_file):
+    """Test initialize() overrides are deep merged into the config."""
+    provider = YAMLConfigProvider(config_file)
+    await provider.initialize({
+        "database": {"port": 6543, "pool": {"size": 5}},
+        "debug": None
+    })
+
+    assert await provider.get("database.host") == "localhost"
+    assert await provider.get("database.port") == 6543
+    assert await provider.get("database.pool.size") == 5
+    assert await provider.get_namespace("debug") == {"debug": None}
+
+
+@pytest.mark.asyncio
+async def test_has(config_file):
+    """Test key existence checks."""
+    provider = YAMLConfigProvider(config_file)
+    assert not await provider.has("app.name")
+
+    await provider.initialize({"feature": {"enabled": None}})
+    assert await provider.has("app.name")
+    assert await provider.has("database")
+    assert await provider.has("feature.enabled")
+    assert not await provider.has("feature.missing")
+    assert not await provider.has("app.name.first")
+
+
+@pytest.mark.asyncio
+async def test_get_through_non_mapping(config_file):
+    """Test lookups through scalar or list values fall back to the default."""
+    provider = YAMLConfigProvider(config_file)
+    await provider.initialize({"hosts": ["a", "b"]})
+
+    assert await provider.get("database.port.number", "n/a") == "n/a"
+    assert await provider.get("hosts.first", "n/a") == "n/a"
+    assert await provider.get_namespace("app.name.first") == {}
+
+
+@pytest.mark.asyncio
+async def test_get_reflects_updates(config_file):
+    """Test lookups see set() calls and edits to returned mappings."""
+    provider = YAMLConfigProvider(config_file)
+    await provider.initialize({})
+
+    assert await provider.get("database.port") == 5432
+    assert await provider.get("database.user", "guest") == "guest"
+
+    await provider.set("database", {"port": 6543, "user": "chad"})
+    assert await provider.get("database.port") == 6543
+    assert await provider.get("database.user", "guest") == "chad"
+
+    database = await provider.get("database")
+    database["port"] = 7654
+    assert await provider.get("database.port") == 7654
+
+
 @pytest.mark.asyncio
 async def test_error_handling():
     """Test error handling."""
@@ -180,3 +292,157 @@ async def test_type_conversion():
             os.unlink(config_path)
         except:
             pass
+
+
+def test_yaml_loader_selection():
+    """Test the C loader is used when libyaml is available."""
+    expected = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    assert YAML_LOADER is expected
+
+
+@pytest.mark.asyncio
+async def test_json_cache(tmp_path):
+    """Test the JSON sidecar cache is written, reused and refreshed."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("service:\n  name: CHAD\n")
+    cache_path = tmp_path / ("config.yaml" + JSON_CACHE_SUFFIX)
+
+    provider = YAMLConfigProvider(str(config_path), json_cache=True)
+    await provider.initialize({})
+    assert cache_path.exists()
+    assert await provider.get("service.name") == "CHAD"
+
+    # A cache matching the source file is preferred over parsing it
+    cached = json.loads(cache_path.read_text())
+    cached["config"]["service"]["name"] = "CACHED"
+    cache_path.write_text(json.dumps(cached))
+    provider = YAMLConfigProvider(str(config_path), json_cache=True)
+    await provider.initialize({})
+    assert await provider.get("service.name") == "CACHED"
+
+    # A modified source file invalidates the cache
+    config_path.write_text("service:\n  name: UPDATED\n")
+    os.utime(config_path, ns=(cached["mtime_ns"], cached["mtime_ns"] + 1))
+    provider = YAMLConfigProvider(str(config_path), json_cache=True)
+    await provider.initialize({})
+    assert await provider.get("service.name") == "UPDATED"
+
+
+@pytest.mark.asyncio
+async def test_json_cache_older_source_restored(tmp_path):
+    """Test restoring a source file with an older mtime invalidates the cache."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("service:\n  name: CHAD\n")
+    original = config_path.stat()
+
+    provider = YAMLConfigProvider(str(config_path), json_cache=True)
+    await provider.initialize({})
+
+    # Like `cp -p` of an older file: new content, earlier mtime
+    config_path.write_text("service:\n  name: RESTORED\n")
+    os.utime(config_path, ns=(original.st_atime_ns,
+                              original.st_mtime_ns - 10**9))
+    provider = YAMLConfigProvider(str(config_path), json_cache=True)
+    await provider.initialize({})
+    assert await provider.get("service.name") == "RESTORED"
+
+
+@pytest.mark.asyncio
+async def test_json_cache_skips_non_json_config(tmp_path):
+    """Test configs that do not round-trip through JSON are not cached."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("ports:\n  80: http\n")
+
+    provider = YAMLConfigProvider(str(config_path), json_cache=True)
+    await provider.initialize({})
+
+    assert not (tmp_path / ("config.yaml" + JSON_CACHE_SUFFIX)).exists()
+    assert (await provider.get("ports"))[80] == "http"
+
+
+@pytest.mark.parametrize("raw", [
+    "true", "false", "null", "~", "0", "-12", "42", "3.25", "-0.5",
+    "010", "yes", "1e3", "[1, 2]", "{a: 1}", "text", "", "On", "NULL",
+    "0x1F", "1_000", "1.5e3", ".inf", "2024-01-01", " padded ", "a: b",
+    "- item", "http://host:80/path", "plain words", "'quoted'", "#comment"
+])
+def test_env_value_fast_path_matches_yaml(raw):
+    """Test the scalar fast path agrees with full YAML parsing."""
+    parsed = yaml.safe_load(raw)
+    if isinstance(parsed, str):
+        try:
+            parsed = float(parsed) if '.' in parsed else int(parsed)
+        except ValueError:
+            pass
+
+    result = YAMLConfigProvider._parse_env_value(raw)
+    assert result == parsed
+    assert type(result) is type(parsed)
+
+
+PARTIAL_YAML = """
+defaults: &defaults
+  retries: 3
+  timeout: 1.5
+pipeline:
+  name: main
+  stages: [fetch, render]
+  options:
+    <<: *defaults
+    retries: 5
+templates:
+  - id: intro
+    enabled: true
+2024: leap
+"""
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("content, top_keys", [
+    (PARTIAL_YAML, {"defaults"}),
+    (PARTIAL_YAML, {"pipeline", "defaults"}),
+    (PARTIAL_YAML, {"pipeline"}),  # alias into a skipped value
+    (PARTIAL_YAML, {"templates", 2024, "missing"}),
+    ("<<: {a: 1}\nb: 2\n", {"a"}),  # root merge key
+    ("- a\n- b\n", {"a"}),  # non-mapping root
+    ("", {"a"}),
+])
+async def test_partial_load_matches_full_load(tmp_path, content, top_keys):
+    """Test selected top-level keys match filtering a full load.
+
+    This holds for documents without duplicate top-level keys.
+    """
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(content)
+    provider = YAMLConfigProvider(str(config_path))
+
+    full = await provider.load(str(config_path))
+    partial = await provider.load(str(config_path), top_keys=top_keys)
+
+    if isinstance(full, dict):
+        full = {k: v for k, v in full.items() if k in top_keys}
+    assert partial == full
+
+
+@pytest.mark.asyncio
+async def test_partial_load_duplicate_keys(tmp_path):
+    """Test the first occurrence of a duplicated key wins in a partial load."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("a: 1\nb: 2\na: 3\n")
+    provider = YAMLConfigProvider(str(config_path))
+
+    assert await provider.load(str(config_path), top_keys={"a"}) == {"a": 1}
+    assert (await provider.load(str(config_path)))["a"] == 3
+
+
+@pytest.mark.asyncio
+async def test_partial_load_stops_early(tmp_path):
+    """Test parsing stops once all requested keys have been read."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("header:\n  version: 2\nbody: [unterminated\n")
+    provider = YAMLConfigProvider(str(config_path))
+
+    assert await provider.load(str(config_path), top_keys={"header"}) == {
+        "header": {"version": 2}}
+    with pytest.raises(ConfigurationError):
+        await provider.load(str(config_path))
@@ -1,6 +1,9 @@
 import pytest
+import sys
 from chad.core.interfaces import (
     ProcessingStatus,
+    TERMINAL_MASK,
+    ACTIVE_MASK,
     ProcessingContext,
     ContentProcessor,
     Plugin,
@@ -29,6 +32,35 @@ def test_processing_context_creation():
     assert context.metadata["test"] == "value"
     assert context.error is None
 
+
+# Test ProcessingStatus
+
+
+def test_processing_status_state_groups():
+    terminal = ProcessingStatus.get_terminal_states()
+    active = ProcessingStatus.get_active_states()
+
+    assert terminal == {ProcessingStatus.COMPLETED, ProcessingStatus.FAILED}
+    assert active == {ProcessingStatus.PENDING, ProcessingStatus.PROCESSING}
+    assert ProcessingStatus.get_terminal_states() is terminal
+
+    for status in ProcessingStatus:
+        assert bool(status & TERMINAL_MASK) == (status in terminal)
+        assert bool(status & ACTIVE_MASK) == (status in active)
+
+
+def test_processing_status_str_repr():
+    assert str(ProcessingStatus.PENDING) == "pending"
+    assert repr(ProcessingStatus.FAILED) == "ProcessingStatus.FAILED"
+
+
+@pytest.mark.skipif(sys.version_info < (3, 11),
+                    reason="composite IntFlag values have no name before 3.11")
+def test_processing_status_composite_str_repr():
+    combined = ProcessingStatus.COMPLETED | ProcessingStatus.FAILED
+    assert str(combined) == combined.name.lower()
+    assert repr(combined) == f"ProcessingStatus.{combined.name}"
+
 # Create mock implementations for testing
 
 
@@ -1,11 +1,16 @@
 import pytest
+import json
+import sys
+import threading
 from datetime import datetime, timedelta
+import chad.core.metrics as metrics_module
 from chad.core.metrics import (
     MetricType,
     MetricValue,
     QualityMetric,
     MetricsRegistry,
-    QualityMetrics
+    QualityMetrics,
+    SynchronizedQualityMetric
 )
 
 
@@ -21,6 +26,24 @@ def test_metric_value():
     assert value.labels == {"env": "test"}
 
 
+def test_metric_value_timestamp_conversion():
+    """Test the datetime view of the nanosecond timestamp."""
+    moment = datetime(2024, 3, 21, 12, 30, 15, 250000)
+    value = MetricValue(
+        value=1.0,
+        timestamp_ns=int(moment.timestamp()) * 10**9 + 250_000_000
+    )
+
+    assert value.timestamp == moment
+
+    converted = MetricValue(value=1.0, timestamp=moment)
+    assert converted.timestamp_ns == value.timestamp_ns
+    assert converted.timestamp == moment
+
+    with pytest.raises(TypeError):
+        MetricValue(value=1.0, timestamp=moment, timestamp_ns=0)
+
+
 def test_quality_metric():
     """Test quality metric functionality."""
     metric = QualityMetric(
@@ -57,6 +80,94 @@ def test_metrics_registry():
         registry.get_metric("non_existent")
 
 
+def test_metrics_registry_recorder():
+    """Test recording through the registry and a held recorder."""
+    registry = MetricsRegistry()
+    registry.register(QualityMetric(
+        name="test_metric",
+        type=MetricType.COUNTER,
+        description="Test metric"
+    ))
+
+    registry.record("test_metric", 1.0)
+    record = registry.get_recorder("test_metric")
+    record(2.0, env="test")
+
+    latest = registry.get_metric("test_metric").get_latest()
+    assert latest.value == 2.0
+    assert latest.labels == {"env": "test"}
+
+    registry.record_batch("test_metric", [(3.0, {}), (4.0, {"env": "prod"})])
+    assert registry.get_metric("test_metric").get_latest().value == 4.0
+
+    with pytest.raises(KeyError):
+        registry.record("non_existent", 1.0)
+    with pytest.raises(KeyError):
+        registry.record_batch("non_existent", [])
+    with pytest.raises(KeyError):
+        registry.get_recorder("non_existent")
+
+
+def test_metrics_registry_snapshot_values():
+    """Test collecting the latest value of every metric."""
+    registry = MetricsRegistry()
+    for name in ("a", "b", "c"):
+        registry.register(QualityMetric(
+            name=name,
+            type=MetricType.GAUGE,
+            description="Test metric",
+            max_samples=2
+        ))
+
+    registry.record("a", 1.0)
+    for value in (0.0, 5.0, 0.0):
+        registry.record("b", value)
+
+    assert registry.snapshot_values() == {"a": 1.0, "b": 0.0}
+    assert registry.get_metric("c").get_latest_value() is None
+
+
+def test_metrics_registry_view():
+    """Test get_all_metrics returns a read-only view tracking changes."""
+    registry = MetricsRegistry()
+    metrics = registry.get_all_metrics()
+    assert len(metrics) == 0
+
+    registry.register(QualityMetric(
+        name="test_metric",
+        type=MetricType.GAUGE,
+        description="Test metric"
+    ))
+    assert "test_metric" in metrics
+
+    with pytest.raises(TypeError):
+        metrics["other"] = None
+
+    registry.unregister("test_metric")
+    assert "test_metric" not in metrics
+
+    with pytest.raises(KeyError):
+        registry.unregister("test_metric")
+
+
+def test_metrics_registry_names():
+    """Test metric names are cached until the registry changes."""
+    registry = MetricsRegistry()
+    assert registry.get_metric_names() == frozenset()
+
+    registry.register(QualityMetric(
+        name="test_metric",
+        type=MetricType.GAUGE,
+        description="Test metric"
+    ))
+    names = registry.get_metric_names()
+    assert names == {"test_metric"}
+    assert registry.get_metric_names() is names
+
+    registry.unregister("test_metric")
+    assert registry.get_metric_names() == frozenset()
+
+
 def test_quality_metrics():
     """Test quality metrics collection."""
     metrics = QualityMetrics()
@@ -76,6 +187,51 @@ def test_quality_metrics():
     assert report["content_length"]["latest_value"] == 100
 
 
+def test_quality_metrics_report_refresh():
+    """Test cached report entries are refreshed when values change."""
+    metrics = QualityMetrics()
+
+    metrics.registry.record("error_count", 1)
+    first = metrics.get_metrics_report()
+    assert first["error_count"]["latest_value"] == 1
+
+    # Mutating a returned report does not leak into later reports
+    first["error_count"]["latest_value"] = 99
+    assert metrics.get_metrics_report()["error_count"]["latest_value"] == 1
+
+    metrics.registry.get_metric("error_count").record(2)
+    assert metrics.get_metrics_report()["error_count"]["latest_value"] == 2
+
+    metrics.registry.unregister("error_count")
+    assert "error_count" not in metrics.get_metrics_report()
+
+
+def test_metrics_report_json(monkeypatch):
+    """Test reports serialize to JSON with ISO timestamps."""
+    metrics = QualityMetrics()
+    metrics.registry.record("content_length", 42)
+    latest = metrics.registry.get_metric("content_length").get_latest()
+
+    # Exercise the standard library fallback used without orjson
+    monkeypatch.setattr(metrics_module, "orjson", None)
+    report = json.loads(metrics.get_metrics_report_json())
+
+    assert report["content_length"]["latest_value"] == 42.0
+    assert report["content_length"]["latest_timestamp"] == (
+        latest.timestamp.isoformat())
+    assert report["error_count"]["latest_value"] is None
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), -float("inf")])
+def test_report_to_json_non_finite(monkeypatch, value):
+    """Test non-finite numbers serialize as null on the fallback path."""
+    monkeypatch.setattr(metrics_module, "orjson", None)
+    report = {"metrics": {"cpu": {"min": value, "values": [1.0, value]}}}
+
+    assert json.loads(metrics_module.report_to_json(report)) == {
+        "metrics": {"cpu": {"min": None, "values": [1.0, None]}}}
+
+
 def test_metric_labels():
     """Test metric labeling functionality."""
     metric = QualityMetric(
@@ -90,3 +246,161 @@ def test_metric_labels():
     values = metric.get_values()
     assert values[0].labels == {"service": "auth", "env": "prod"}
     assert values[1].labels == {"service": "auth", "env": "dev"}
+
+
+def test_metric_labels_per_sample():
+    """Test each sample keeps its own mutable labels dict."""
+    metric = QualityMetric(
+        name="test_metric",
+        type=MetricType.COUNTER,
+        description="Test metric"
+    )
+
+    metric.record(1.0, service="auth")
+    metric.record(2.0, service="auth")
+    metric.get_latest().labels["service"] = "edited"
+
+    first, second = metric.get_values()
+    assert first.labels == {"service": "auth"}
+    assert second.labels == {"service": "edited"}
+
+
+def test_metric_values_materialized():
+    """Test stored samples are returned as MetricValue objects in order."""
+    metric = QualityMetric(
+        name="test_metric",
+        type=MetricType.GAUGE,
+        description="Test metric"
+    )
+
+    before = datetime.now()
+    metric.record(1, env="test")
+    metric.record(2.5)
+
+    values = metric.get_values()
+    assert [v.value for v in values] == [1.0, 2.5]
+    assert all(isinstance(v, MetricValue) for v in values)
+    assert before - timedelta(seconds=1) <= values[0].timestamp
+    assert values[0].timestamp <= values[1].timestamp
+    assert values[0].labels == {"env": "test"}
+    assert values[1].labels == {}
+
+
+def test_metric_sample_retention():
+    """Test only the most recent samples are kept once the buffer is full."""
+    metric = QualityMetric(
+        name="test_metric",
+        type=MetricType.GAUGE,
+        description="Test metric",
+        max_samples=3
+    )
+
+    for i in range(5):
+        metric.record(float(i), seq=str(i))
+
+    values = metric.get_values()
+    assert [v.value for v in values] == [2.0, 3.0, 4.0]
+    assert [v.labels["seq"] for v in values] == ["2", "3", "4"]
+    assert metric.get_latest().value == 4.0
+
+
+def test_metric_stats():
+    """Test running statistics cover every recorded value."""
+    metric = QualityMetric(
+        name="test_metric",
+        type=MetricType.HISTOGRAM,
+        description="Test metric",
+        max_samples=2
+    )
+    assert metric.get_stats()["count"] == 0
+
+    for value in (2.0, 4.0, 4.0, 4.0, 5.0, 5.0, 7.0, 9.0):
+        metric.record(value)
+
+    stats = metric.get_stats()
+    assert stats["count"] == 8
+    assert stats["sum"] == 40.0
+    assert stats["min"] == 2.0
+    assert stats["max"] == 9.0
+    assert stats["mean"] == 5.0
+    assert stats["variance"] == pytest.approx(4.0)
+
+
+def test_metric_windowed_stats():
+    """Test stats over retained values, optionally limited to a window."""
+    metric = QualityMetric(
+        name="test_metric",
+        type=MetricType.GAUGE,
+        description="Test metric",
+        max_samples=4
+    )
+    assert metric.get_window_stats()["count"] == 0
+
+    for value in (1.0, 2.0, 3.0, 4.0, 5.0, 6.0):
+        metric.record(value)
+    # Age the two oldest retained samples (3.0 and 4.0) by an hour
+    for i in range(2):
+        metric._timestamps[(metric._head + i) % 4] -= 3600 * 10**9
+
+    assert metric.get_window_stats() == {
+        "count": 4, "sum": 18.0, "min": 3.0, "max": 6.0, "mean": 4.5
+    }
+    assert metric.get_window_stats(window_ns=60 * 10**9) == {
+        "count": 2, "sum": 11.0, "min": 5.0, "max": 6.0, "mean": 5.5
+    }
+    assert metric.get_window_stats(window_ns=-10**9)["count"] == 0
+
+
+def test_metric_slots():
+    """Test metric objects do not carry a per-instance __dict__."""
+    metric = QualityMetric(
+        name="test_metric",
+        type=MetricType.GAUGE,
+        description="Test metric"
+    )
+    metric.record(1.0)
+
+    assert not hasattr(metric, "__dict__")
+    assert not hasattr(metric.get_latest(), "__dict__")
+
+
+def test_metric_name_interned():
+    """Test metric names are interned strings."""
+    name = "".join(["interned", "_metric"])
+    metric = QualityMetric(name, MetricType.GAUGE, "Interned")
+
+    assert metric.name is sys.intern("interned_metric")
+
+    class MetricName(str):
+        pass
+
+    named = QualityMetric(MetricName("custom"), MetricType.GAUGE, "Subclass")
+    assert type(named.name) is MetricName
+    assert named.name == "custom"
+
+
+def test_synchronized_metric_threads():
+    """Test a synchronized metric stays consistent under concurrent use."""
+    metric = SynchronizedQualityMetric(
+        name="test_metric",
+        type=MetricType.HISTOGRAM,
+        description="Test metric",
+        max_samples=50
+    )
+
+    def writer():
+        for i in range(2000):
+            metric.record(float(i), worker="w")
+
+    threads = [threading.Thread(target=writer) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        values = metric.get_values()
+        assert len(values) <= 50
+    for thread in threads:
+        thread.join()
+
+    assert metric.count == 8000
+    assert len(metric.get_values()) == 50
+    assert metric.get_stats()["sum"] == 4 * sum(range(2000))
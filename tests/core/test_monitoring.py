@@ -1,3 +1,4 @@
+import gc
 import pytest
 from datetime import datetime, timedelta
 from time import sleep
@@ -5,7 +6,19 @@ from chad.core.monitoring import (
     PerformanceSnapshot,
     PerformanceMonitor
 )
-from chad.core.metrics import MetricsRegistry
+from chad.core.metrics import (
+    MetricsRegistry, QualityMetric, SynchronizedQualityMetric, MetricType
+)
+
+
+def take_snapshot_ago(monitor, ago):
+    """Take a snapshot with the monitor's clock set back by ago."""
+    shift = ago // timedelta(microseconds=1) * 1000
+    monitor._clock_offset_ns -= shift
+    try:
+        return monitor.take_snapshot()
+    finally:
+        monitor._clock_offset_ns += shift
 
 
 def test_performance_snapshot():
@@ -21,6 +34,7 @@ def test_performance_snapshot():
 
     assert snapshot.metrics == metrics
     assert snapshot.context == context
+    assert not hasattr(snapshot, "__dict__")
 
 
 def test_performance_monitor_setup():
@@ -106,3 +120,311 @@ def test_snapshot_filtering():
     )
     assert len(recent) == 1
     assert recent[0].metrics["cpu"] == 50.0
+
+
+def test_performance_report_window():
+    """Test reports only aggregate snapshots inside the window."""
+    registry = MetricsRegistry()
+    monitor = PerformanceMonitor(registry)
+
+    registry.record("cpu_usage", 90.0)
+    take_snapshot_ago(monitor, timedelta(minutes=10))
+    registry.record("cpu_usage", 30.0)
+    registry.record("memory_usage", 512.0)
+    monitor.take_snapshot()
+
+    report = monitor.get_performance_report(window=timedelta(minutes=5))
+    assert report["total_snapshots"] == 1
+    assert report["metrics"]["cpu_usage"] == {
+        "min": 30.0, "max": 30.0, "avg": 30.0, "samples": 1}
+    assert report["metrics"]["memory_usage"]["samples"] == 1
+
+    report = monitor.get_performance_report(window=timedelta(minutes=15))
+    assert report["total_snapshots"] == 2
+    assert report["metrics"]["cpu_usage"]["max"] == 90.0
+    assert report["metrics"]["cpu_usage"]["avg"] == 60.0
+    assert report["metrics"]["memory_usage"]["samples"] == 1
+
+
+def test_performance_report_history():
+    """Test aggregates older than the configured history are dropped."""
+    registry = MetricsRegistry()
+    monitor = PerformanceMonitor(
+        registry,
+        history=timedelta(minutes=2),
+        bucket_size=timedelta(minutes=1)
+    )
+
+    registry.record("cpu_usage", 1.0)
+    for minutes in (3, 2, 1):
+        take_snapshot_ago(monitor, timedelta(minutes=minutes))
+
+    report = monitor.get_performance_report(window=timedelta(minutes=10))
+    assert report["total_snapshots"] == 2
+
+    assert "error" in PerformanceMonitor(MetricsRegistry()).get_performance_report()
+    with pytest.raises(ValueError):
+        PerformanceMonitor(MetricsRegistry(), bucket_size=timedelta(0))
+
+
+def test_snapshot_capacity():
+    """Test only the most recent snapshots are kept."""
+    registry = MetricsRegistry()
+    monitor = PerformanceMonitor(registry, capacity=2)
+
+    for value in (10.0, 20.0, 30.0):
+        registry.record("cpu_usage", value)
+        monitor.take_snapshot()
+
+    snapshots = monitor.get_snapshots()
+    assert [s.metrics["cpu_usage"] for s in snapshots] == [20.0, 30.0]
+
+    # Aggregates still cover every snapshot
+    report = monitor.get_performance_report(window=timedelta(minutes=1))
+    assert report["total_snapshots"] == 3
+    assert report["metrics"]["cpu_usage"]["min"] == 10.0
+
+    # Older snapshots are trimmed in bulk but never returned
+    monitor = PerformanceMonitor(MetricsRegistry(), capacity=8)
+    taken = [monitor.take_snapshot() for _ in range(30)]
+    assert monitor.get_snapshots() == taken[-8:]
+    assert monitor.get_snapshots(start_time=taken[0].timestamp) == taken[-8:]
+    assert len(monitor._snapshots) <= 10
+
+
+def test_snapshot_range_bounds():
+    """Test snapshot range lookup with start and end bounds."""
+    registry = MetricsRegistry()
+    monitor = PerformanceMonitor(registry)
+
+    base = datetime(2024, 3, 21, 12, 0, 0)
+    monitor._snapshots.extend(
+        PerformanceSnapshot(base + timedelta(minutes=i), {"cpu": float(i)}, {})
+        for i in range(10)
+    )
+
+    def cpu(snapshots):
+        return [s.metrics["cpu"] for s in snapshots]
+
+    assert cpu(monitor.get_snapshots(
+        base + timedelta(minutes=3), base + timedelta(minutes=5))) == [3.0, 4.0, 5.0]
+    assert cpu(monitor.get_snapshots(
+        end_time=base + timedelta(seconds=90))) == [0.0, 1.0]
+    assert cpu(monitor.get_snapshots(start_time=base + timedelta(minutes=8))) == [8.0, 9.0]
+    assert monitor.get_snapshots(start_time=base + timedelta(hours=1)) == []
+    assert len(monitor.get_snapshots()) == 10
+
+
+def test_snapshot_includes_late_registered_metrics():
+    """Test metrics registered after the monitor are still captured."""
+    registry = MetricsRegistry()
+    monitor = PerformanceMonitor(registry)
+
+    registry.register(QualityMetric(
+        name="queue_depth",
+        type=MetricType.GAUGE,
+        description="Pending items"
+    ))
+    registry.record("queue_depth", 7.0)
+
+    assert monitor.take_snapshot().metrics == {"queue_depth": 7.0}
+    report = monitor.get_performance_report(window=timedelta(minutes=1))
+    assert report["metrics"]["queue_depth"]["avg"] == 7.0
+
+
+def test_batched_time_measurement():
+    """Test latencies are queued and recorded in batches."""
+    registry = MetricsRegistry()
+    monitor = PerformanceMonitor(registry, latency_batch_size=3)
+    latency = registry.get_metric("latency")
+
+    for _ in range(2):
+        with monitor.measure_time("batched", env="test"):
+            pass
+    assert latency.get_latest() is None
+
+    with monitor.measure_time("batched", env="test"):
+        pass
+    assert len(latency.get_values()) == 3
+    assert latency.get_latest().labels == {"operation": "batched", "env": "test"}
+
+    with monitor.measure_time("batched"):
+        pass
+    monitor.take_snapshot()
+    assert len(latency.get_values()) == 4
+
+
+def test_performance_report_after_history_wraps():
+    """Test windowed reports once old buckets have been overwritten."""
+    registry = MetricsRegistry()
+    monitor = PerformanceMonitor(
+        registry,
+        history=timedelta(minutes=3),
+        bucket_size=timedelta(minutes=1)
+    )
+
+    for minutes in range(5, -1, -1):
+        registry.record("cpu_usage", float(minutes))
+        take_snapshot_ago(monitor, timedelta(minutes=minutes))
+
+    report = monitor.get_performance_report(window=timedelta(minutes=30))
+    assert report["total_snapshots"] == 3
+    assert report["metrics"]["cpu_usage"]["max"] == 2.0
+    assert report["metrics"]["cpu_usage"]["min"] == 0.0
+
+    # Only the current bucket
+    report = monitor.get_performance_report(window=timedelta(0))
+    assert report["total_snapshots"] == 1
+    assert report["metrics"]["cpu_usage"]["avg"] == 0.0
+
+
+def test_performance_report_exact_extremes():
+    """Test reported extremes keep the recorded values exactly."""
+    registry = MetricsRegistry()
+    monitor = PerformanceMonitor(registry)
+
+    for value in (1234567891.0, 1234567891.0):
+        registry.record("memory_usage", value)
+        monitor.take_snapshot()
+    registry.record("cpu_usage", 50.1)
+    monitor.take_snapshot()
+
+    metrics = monitor.get_performance_report(window=timedelta(minutes=1))["metrics"]
+    assert metrics["memory_usage"]["min"] == 1234567891.0
+    assert metrics["memory_usage"]["max"] == 1234567891.0
+    assert metrics["cpu_usage"]["min"] == 50.1
+
+
+def test_time_measurement_on_error():
+    """Test latency is recorded when the measured block raises."""
+    registry = MetricsRegistry()
+    monitor = PerformanceMonitor(registry)
+
+    with pytest.raises(RuntimeError):
+        with monitor.measure_time("failing", env="test"):
+            raise RuntimeError("boom")
+
+    latest = registry.get_metric("latency").get_latest()
+    assert latest.labels == {"operation": "failing", "env": "test"}
+
+
+def test_context_retention():
+    """Test old snapshots drop their context but keep their metrics."""
+    registry = MetricsRegistry()
+    monitor = PerformanceMonitor(registry, context_retention=timedelta(0))
+
+    registry.record("cpu_usage", 10.0)
+    first = monitor.take_snapshot({"request": "a"})
+    assert first.context == {"request": "a"}
+
+    sleep(0.001)
+    second = monitor.take_snapshot({"request": "b"})
+    assert first.context == {}
+    assert first.metrics["cpu_usage"] == 10.0
+    assert second.context == {"request": "b"}
+
+    with pytest.raises(ValueError):
+        PerformanceMonitor(MetricsRegistry(),
+                           context_retention=timedelta(seconds=-1))
+
+
+def test_snapshot_timestamps_monotonic():
+    """Test snapshot times track the wall clock and never go backwards."""
+    monitor = PerformanceMonitor(MetricsRegistry())
+
+    before = datetime.now()
+    snapshots = [monitor.take_snapshot() for _ in range(50)]
+    after = datetime.now()
+
+    timestamps = [s.timestamp for s in snapshots]
+    assert timestamps == sorted(timestamps)
+    assert before - timedelta(seconds=1) <= timestamps[0]
+    assert timestamps[-1] <= after + timedelta(seconds=1)
+
+
+def test_performance_report_cache(monkeypatch):
+    """Test reports are reused until data, metrics or the window change."""
+    registry = MetricsRegistry()
+    monitor = PerformanceMonitor(registry, report_cache_ttl=timedelta(hours=1))
+    builds = []
+    build_report = monitor._build_report
+    monkeypatch.setattr(monitor, "_build_report",
+                        lambda *args: builds.append(args) or build_report(*args))
+
+    registry.record("cpu_usage", 10.0)
+    registry.record("memory_usage", 512.0)
+    monitor.take_snapshot()
+    report = monitor.get_performance_report()
+    # Callers get copies, so edits do not reach later reports
+    report["metrics"].clear()
+    assert "cpu_usage" in monitor.get_performance_report()["metrics"]
+    assert len(builds) == 1
+
+    monitor.invalidate_cache()
+    monitor.get_performance_report()
+    assert len(builds) == 2
+
+    # Same number of metrics, different set of metrics
+    registry.unregister("memory_usage")
+    registry.register(QualityMetric("queue_depth", MetricType.GAUGE, "Queue"))
+    assert "memory_usage" not in monitor.get_performance_report()["metrics"]
+    assert len(builds) == 3
+
+    # Only the latest window is kept
+    monitor.get_performance_report(window=timedelta(minutes=1))
+    monitor.get_performance_report()
+    assert len(builds) == 5
+
+    registry.record("cpu_usage", 20.0)
+    monitor.take_snapshot()
+    assert monitor.get_performance_report()["total_snapshots"] == 2
+    assert len(builds) == 6
+
+    uncached = PerformanceMonitor(MetricsRegistry(),
+                                  report_cache_ttl=timedelta(0))
+    uncached.get_performance_report()
+    assert uncached._report_cache is None
+
+
+def test_background_latency_flush():
+    """Test queued latencies are flushed by the background thread."""
+    registry = MetricsRegistry()
+    monitor = PerformanceMonitor(registry, latency_batch_size=100,
+                                 flush_interval=timedelta(milliseconds=10))
+    latency = registry.get_metric("latency")
+    assert isinstance(latency, SynchronizedQualityMetric)
+
+    try:
+        with monitor.measure_time("background"):
+            pass
+        for _ in range(100):
+            if latency.count:
+                break
+            sleep(0.01)
+        assert latency.count == 1
+
+        with monitor.measure_time("closing"):
+            pass
+    finally:
+        monitor.close()
+    assert latency.get_latest().labels == {"operation": "closing"}
+    assert monitor._flush_thread is None
+
+
+def test_background_flush_requires_batching():
+    """Test flush_interval is rejected when latencies are not queued."""
+    with pytest.raises(ValueError):
+        PerformanceMonitor(MetricsRegistry(),
+                           flush_interval=timedelta(milliseconds=10))
+
+
+def test_background_flush_stops_when_collected():
+    """Test the flush thread does not keep an unused monitor alive."""
+    monitor = PerformanceMonitor(MetricsRegistry(), latency_batch_size=10,
+                                 flush_interval=timedelta(milliseconds=10))
+    thread = monitor._flush_thread
+    del monitor
+    gc.collect()
+
+    thread.join(timeout=5)
+    assert not thread.is_alive()
@@ -1,4 +1,5 @@
 import pytest
+from typing import List
 from chad.core.validation import (
     ValidationRule,
     Validator,
@@ -21,6 +22,20 @@ def test_validation_rule():
     assert not rule.check(123)
 
 
+def test_validation_rule_name_subclass():
+    """Test rule names may be str subclasses."""
+    class RuleName(str):
+        pass
+
+    rule = ValidationRule(
+        name=RuleName("custom"),
+        check=bool,
+        message="Value must be truthy"
+    )
+    assert type(rule.name) is RuleName
+    assert rule.name == "custom"
+
+
 def test_validator_basic():
     """Test basic validator functionality."""
     validator = Validator()
@@ -76,6 +91,29 @@ def test_config_validator():
     assert "must be of type" in str(exc.value.details)
 
 
+def test_config_validator_error_records():
+    """Test schema failures report the field rule and extra rules still run."""
+    validator = ConfigValidator({"name": str, "count": int})
+    validator.add_rule(ValidationRule(
+        name="has_name",
+        check=lambda x: bool(x.get("name")),
+        message="Name is required"
+    ))
+
+    with pytest.raises(ValidationError) as exc:
+        validator.validate({"name": "", "count": 1.5})
+
+    errors = exc.value.details["errors"]
+    assert [e["rule"] for e in errors] == ["type_count", "has_name"]
+    assert errors[0]["message"] == "Field 'count' must be of type int"
+    assert errors[0]["details"] == {"field": "count", "expected_type": "int"}
+
+    with pytest.raises(ValidationError) as exc:
+        validator.validate(None)
+    rules = [e["rule"] for e in exc.value.details["errors"]]
+    assert rules == ["type_name", "type_count", "has_name"]
+
+
 def test_multiple_validation_errors():
     """Test collecting multiple validation errors."""
     validator = Validator()
@@ -98,3 +136,210 @@ def test_multiple_validation_errors():
     assert len(errors) == 2
     assert any("Length must be at least 3" in e["message"] for e in errors)
     assert any("Must be alphanumeric" in e["message"] for e in errors)
+
+
+def test_validator_without_rules():
+    """Test a validator without rules accepts anything."""
+    validator = Validator()
+
+    assert validator.validate(None)
+    assert validator.errors == ()
+
+
+def test_validation_errors_reset():
+    """Test errors from a previous run do not leak into later results."""
+    validator = Validator()
+    validator.add_rule(ValidationRule(
+        name="is_positive",
+        check=lambda x: x > 0,
+        message="Value must be positive"
+    ))
+
+    with pytest.raises(ValidationError) as exc:
+        validator.validate(-1)
+    assert len(validator.errors) == 1
+
+    assert validator.validate(1)
+    assert validator.errors == ()
+    # The raised error keeps its own details
+    assert len(exc.value.details["errors"]) == 1
+
+
+def test_config_validator_compiled_check_reused():
+    """Test validators with the same schema share the generated check."""
+    first = ConfigValidator({"name": str, "count": int})
+    second = ConfigValidator({"name": str, "count": int})
+    other = ConfigValidator({"name": str})
+
+    assert first._check_schema is second._check_schema
+    assert first._check_schema is not other._check_schema
+
+    # Keys are bound as values, not spliced into generated source
+    odd = ConfigValidator({"it's \"odd\"\n": int})
+    assert odd.validate({"it's \"odd\"\n": 1})
+    with pytest.raises(ValidationError):
+        odd.validate({})
+
+
+def test_safe_rules():
+    """Test safe rules are checked alongside rules that may raise."""
+    validator = Validator()
+    validator.add_rule(ValidationRule(
+        name="is_str",
+        check=lambda x: isinstance(x, str),
+        message="Must be a string",
+        safe=True
+    ))
+    validator.add_rule(ValidationRule(
+        name="alphanumeric",
+        check=lambda x: x.isalnum(),
+        message="Must be alphanumeric"
+    ))
+
+    assert validator.validate("abc")
+
+    with pytest.raises(ValidationError) as exc:
+        validator.validate(5)
+
+    errors = exc.value.details["errors"]
+    assert [e["rule"] for e in errors] == ["is_str", "alphanumeric"]
+    assert errors[0]["message"] == "Must be a string"
+    assert "Validation check failed" in errors[1]["message"]
+
+
+def test_config_validator_schema_cached():
+    """Test validators for one schema share their prepared rule names."""
+    first = ConfigValidator({"name": str, "count": int})
+    second = ConfigValidator({"name": str, "count": int})
+
+    assert first._schema_rule_names is second._schema_rule_names
+    assert first._schema_rule_names == ("type_name", "type_count")
+
+
+def test_config_validator_error_records_independent():
+    """Test editing a reported error does not affect later failures."""
+    first = ConfigValidator({"count": int})
+    second = ConfigValidator({"count": int})
+
+    with pytest.raises(ValidationError) as exc:
+        first.validate({"count": "1"})
+    exc.value.details["errors"][0]["message"] = "edited"
+    exc.value.details["errors"][0]["details"]["field"] = "edited"
+
+    with pytest.raises(ValidationError) as exc:
+        second.validate({"count": "1"})
+    record = exc.value.details["errors"][0]
+    assert record["rule"] == "type_count"
+    assert record["message"] == "Field 'count' must be of type int"
+    assert record["details"] == {"field": "count", "expected_type": "int"}
+
+
+def test_config_validator_check_exceptions():
+    """Test exceptions raised by schema checks are reported as errors."""
+    validator = ConfigValidator({"name": str, "tags": List[str]})
+
+    with pytest.raises(ValidationError) as exc:
+        validator.validate({"name": 1, "tags": ["x"]})
+    errors = exc.value.details["errors"]
+    assert [e["rule"] for e in errors] == ["type_name", "type_tags"]
+    reason = errors[1]["details"]["error"]
+    assert errors[1]["message"] == f"Validation check failed: {reason}"
+
+    class BrokenMapping(dict):
+        def get(self, key, default=None):
+            raise RuntimeError("unreadable")
+
+    with pytest.raises(ValidationError) as exc:
+        ConfigValidator({"count": int}).validate(BrokenMapping())
+    assert exc.value.details["errors"] == [{
+        "rule": "type_count",
+        "message": "Validation check failed: unreadable",
+        "details": {"error": "unreadable"}
+    }]
+
+
+def test_fail_fast():
+    """Test fail_fast stops at the first failing rule."""
+    calls = []
+    validator = ConfigValidator({"name": str, "count": int})
+    validator.add_rule(ValidationRule(
+        name="tracked",
+        check=lambda x: calls.append(x) or False,
+        message="Always fails"
+    ))
+
+    with pytest.raises(ValidationError) as exc:
+        validator.validate({"name": 1, "count": "x"}, fail_fast=True)
+    assert [e["rule"] for e in exc.value.details["errors"]] == ["type_name"]
+    assert calls == []
+
+    with pytest.raises(ValidationError) as exc:
+        validator.validate(None, fail_fast=True)
+    assert [e["rule"] for e in exc.value.details["errors"]] == ["type_name"]
+
+    with pytest.raises(ValidationError) as exc:
+        validator.validate({"name": 1, "count": "x"})
+    assert len(exc.value.details["errors"]) == 3
+
+
+def test_rules_reordered_by_failures():
+    """Test frequently failing rules move to the front of the check order."""
+    calls = []
+
+    def tracked(name, check):
+        def wrapped(x):
+            calls.append(name)
+            return check(x)
+        return wrapped
+
+    validator = Validator(reorder_every=2)
+    validator.add_rule(ValidationRule(
+        name="is_str",
+        check=tracked("is_str", lambda x: isinstance(x, str)),
+        message="Must be a string"
+    ))
+    validator.add_rule(ValidationRule(
+        name="short",
+        check=tracked("short", lambda x: len(x) < 4),
+        message="Must be short"
+    ))
+
+    for _ in range(2):
+        with pytest.raises(ValidationError):
+            validator.validate("too long", fail_fast=True)
+
+    calls.clear()
+    with pytest.raises(ValidationError) as exc:
+        validator.validate("too long", fail_fast=True)
+    assert calls == ["short"]
+    assert exc.value.details["errors"][0]["rule"] == "short"
+
+    with pytest.raises(ValueError):
+        Validator(reorder_every=-1)
+
+
+def test_rules_reordered_by_failure_rate():
+    """Test ordering uses failures per evaluation, not raw failure counts."""
+    calls = []
+    validator = Validator(reorder_every=10)
+    # "even" fails 50% of inputs; "small" fails 60% of the inputs it sees
+    validator.add_rule(ValidationRule(
+        name="even",
+        check=lambda x: calls.append("even") or x % 2 == 1,
+        message="Must be odd"
+    ))
+    validator.add_rule(ValidationRule(
+        name="small",
+        check=lambda x: calls.append("small") or x not in (0, 1, 2, 3, 4, 5),
+        message="Must not be small"
+    ))
+
+    for value in range(10):
+        try:
+            validator.validate(value, fail_fast=True)
+        except ValidationError:
+            pass
+
+    calls.clear()
+    validator.validate(7, fail_fast=True)
+    assert calls == ["small", "even"]